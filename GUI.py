@@ -184,6 +184,27 @@ encipher_text_button.place(
     x=800.0, y=417.0, width=135.372802734375, height=42.25373077392578
 )
 
+# Encipher the input text while it is typed. Only the text from the first changed char is enciphered again.
+input_text.bind(
+    "<KeyRelease>",
+    lambda event: gui_event_handlers.live_encipher_text(
+        input_text.get("1.0", "end-1c"),
+        gui_event_handlers.get_plugboard_2D_array(plugboard_inputs),
+        gui_event_handlers.get_rotor_settings(
+            rotor_left_number,
+            rotor_left_position,
+            rotor_left_shift,
+            rotor_center_number,
+            rotor_center_position,
+            rotor_center_shift,
+            rotor_right_number,
+            rotor_right_position,
+            rotor_right_shift,
+        ),
+        output_text,
+    ),
+)
+
 # Copy
 copy_img = PhotoImage(file=relative_to_assets("Copy button.png"))
 copy_button = Button(
@@ -321,7 +342,7 @@ arrows = canvas.create_image(1125.833740234375, 524.8312683105469, image=arrows_
 
 """Add rotors"""
 # Rotor number selection
-rotor_choices = ["I", "II", "III", "IV", "V"]
+rotor_choices = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
 
 rotor_left_number = ttk.Combobox(window, values=rotor_choices)
 rotor_left_number.place(x=1060, y=112, width=35, height=20)
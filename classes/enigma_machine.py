@@ -0,0 +1,668 @@
+"""
+This is the class that defines a complete Enigma machine.
+It is built once from the rotors, the plugboard and the reflector and can then encipher any amount of text.
+"""
+
+import sys
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+
+from classes.rotor import Rotor
+from src import components, enigma_parts, shared_tables
+
+
+class _StateCache(list):
+    """
+    A permutation cache with a slot for every state. A list subclass, so that it can be shared through a WeakValueDictionary.
+    """
+
+
+class EnigmaMachine:
+    """
+    This class defines a reusable, stateful Enigma machine.
+
+    All the substitution tables (rotors, reflector and plugboard) are computed once when the machine is built,
+    so enciphering a letter is just a few list lookups and no objects are created per letter.
+
+    Attributes:
+    - rotors (tuple): The 3 rotors of the machine. rotors[0] is the right most rotor, rotors[2] is the left rotor.
+    - plugboard (tuple): The plugboard as a 26 entry table. plugboard[letter] is the letter it is swapped with.
+    - reflector (tuple): The reflector wiring. UKW-B by default, or UKW-B thin for the M4.
+    For the M4, the Greek wheel and the thin reflector composed into one table. See : enigma_parts.create_m4_reflector()
+    - greek_rotor (Rotor): The Greek wheel of the M4, the fourth rotor that never turns. None for the 3 rotor machines.
+    - positions (tuple): The current positions of the 3 rotors, in the same order as the rotors.
+    - offsets (tuple): The current offsets (position - setting) of the 3 rotors. Only the offsets change the wiring.
+    - cache_size (int): How many machine states keep their whole signal path as one permutation. 0 turns the cache off.
+    - tables: Precomputed rotor and core tables to read from instead of composing them, like a shared memory segment. See : shared_tables.py
+
+    Methods:
+    - encipher(text: str) -> str:
+        Enciphers the text and advances the rotors, exactly like ciphering_algorithm.encipher() does.
+
+    - set_positions(position_1: int, position_2: int, position_3: int) -> None:
+        Sets the rotors to new positions, for example the start positions of the next message.
+
+    - seek(offset: int) -> None:
+        Moves the rotors to where they are after the given number of letters from the start positions.
+
+    - encipher_bytes(data: bytes) -> bytes:
+        Same as encipher(), for ASCII bytes. No strings are built and no char is converted with ord() or chr().
+
+    - encipher_into(source, target) -> None:
+        Enciphers an ASCII buffer (bytes, mmap, memoryview) into a writable buffer of the same size, without building any strings.
+
+    - clear_cache() -> None:
+        Empties the permutation cache.
+
+    - permutation(position_1: int, position_2: int, position_3: int) -> tuple:
+        Returns the whole signal path of the machine at the given rotor positions as one permutation.
+
+    - state_cycles() -> list[tuple[list, list]]:
+        Returns the rotor states in the order the rotors go through them, with the permutation of every next state.
+    """
+
+    # Only position - setting (the offset) changes the wiring of a rotor, so every table below is by offset.
+    # Machines with the same rotors and reflector have the same cores, whatever their ring settings, so they share them.
+    # {(middle rotor number, left rotor number, reflector): {offset_2 + 26 * offset_3: core}}
+    # Least recently used first. Only the SHARED_CORES_LIMIT most recently used keys are kept, because every M4 Greek wheel offset
+    # and thin reflector composes another reflector, so a long M4 search would otherwise keep adding keys.
+    _shared_cores = OrderedDict()
+    SHARED_CORES_LIMIT = 64
+
+    # Machines with the same rotors, reflector and plugboard also have the same permutation for every offset state.
+    # The caches with a slot for every state are shared between them, as long as one of the machines uses it.
+    # {(rotor numbers, reflector, plugboard): _StateCache}
+    _shared_caches = WeakValueDictionary()
+
+    def __init__(
+        self,
+        rotor_1: Rotor,
+        rotor_2: Rotor,
+        rotor_3: Rotor,
+        plugboard_settings: list[int, int],
+        reflector: tuple = None,
+        cache_size: int = 0,
+        tables=None,
+        greek_rotor: Rotor = None,
+    ):
+        # The rotors. rotor_1 is the right most rotor, rotor_3 is the left rotor.
+        self._rotors = (rotor_1, rotor_2, rotor_3)
+
+        # The Greek wheels never turn and have no notch, so they can only be the fourth rotor of the M4, never one of the 3 turning rotors
+        if any(rotor.number not in components.ROTORS for rotor in self._rotors):
+            raise ValueError(
+                f"GreekRotorError. Rotors {[rotor.number for rotor in self._rotors]} can only be rotors 1-8! "
+                "The Greek wheels can only be the greek_rotor of the M4."
+            )
+        if greek_rotor is not None and greek_rotor.number not in components.GREEK_ROTORS:
+            raise ValueError(f"GreekRotorError. Rotor {greek_rotor.number} is not a Greek wheel (Beta or Gamma)!")
+
+        # The plugboard as a table, so every letter has an entry, even the ones without a pair
+        self._plugboard = enigma_parts.create_plugboard_table(plugboard_settings)
+
+        # The reflector wiring. The M4 Greek wheel never turns, so with the thin reflector it is one more fixed table,
+        # and the M4 enciphers exactly like a 3 rotor machine with that table as its reflector.
+        self._greek_rotor = greek_rotor
+        if greek_rotor is None:
+            self._reflector = reflector if reflector is not None else enigma_parts.UKW_B_REFLECTOR
+        else:
+            thin_reflector = reflector if reflector is not None else enigma_parts.UKW_B_THIN_REFLECTOR
+            self._reflector = enigma_parts.create_m4_reflector(greek_rotor, thin_reflector)
+        reflector = self._reflector
+
+        # The precomputed tables, if any. Only the few tables this machine uses are read from them.
+        self._tables = tables
+        if tables is not None:
+            self._tables_rotors_count = shared_tables.check_tables(tables, reflector)
+
+            if any(isinstance(rotor.number, int) and rotor.number > self._tables_rotors_count for rotor in self._rotors):
+                print("TablesRotorError. The table block has no tables for these rotors!")
+                sys.exit(1)
+
+        # The machine state is kept as the offset (position - setting) of every rotor, because only the offset changes the wiring.
+        # The ring setting only moves the notches, so the notches are kept as the offsets at which every rotor turns the next one:
+        # turnovers[rotor][offset] is True if the rotor turns the next one when it lands on that offset. Rotors VI-VIII have two notches.
+        # Machines that only differ in their ring settings then go through the same offset states, and share their cores and caches.
+        self._settings = tuple(rotor.setting for rotor in self._rotors)
+        self._turnovers = tuple(
+            tuple((offset + rotor.setting) % 26 in rotor.notches for offset in range(26)) for rotor in self._rotors
+        )
+        self._offsets = self._to_offsets(tuple(rotor.position for rotor in self._rotors))
+        # The positions the message started from, normalized to 0-25 (position 26 behaves exactly like position 0). seek() counts from here.
+        self._start_positions = tuple(rotor.position % 26 for rotor in self._rotors)
+
+        # Substitution tables of every rotor for every one of its offsets, in both directions.
+        # self._forward[rotor_index][offset][letter] and self._inverse[rotor_index][offset][letter]
+        self._forward = tuple(
+            self._build_offset_tables(rotor, is_reversed=False, tables=tables) for rotor in self._rotors
+        )
+        self._inverse = tuple(
+            self._build_offset_tables(rotor, is_reversed=True, tables=tables) for rotor in self._rotors
+        )
+
+        # The right most rotor turns on every letter, so the plugboard is folded into its tables.
+        # self._entry_tables[offset][letter] = plugboard, then the right most rotor.
+        # self._exit_tables[offset][letter] = the right most rotor in reverse, then the plugboard.
+        self._entry_tables = tuple(
+            [table[self._plugboard[letter]] for letter in range(26)]
+            for table in self._forward[0]
+        )
+        self._exit_tables = tuple(
+            [self._plugboard[table[letter]] for letter in range(26)]
+            for table in self._inverse[0]
+        )
+        # The exit tables again, but with the ASCII code of the letter that comes out, for enciphering bytes
+        self._exit_code_tables = tuple(
+            bytes(letter + ord("A") for letter in table) for table in self._exit_tables
+        )
+
+        # The middle rotor, the left rotor and the reflector (and back through the left and middle rotors) together are the "core".
+        # They only change when the middle or the left rotor turns, which is rare, so every core is composed once.
+        # {offset_2 + 26 * offset_3: core}. There are only 26 * 26 cores, so this stays tiny. Shared with the machines with the same rotors.
+        self._cores = self._shared_cores_of((rotor_2.number, rotor_3.number, tuple(reflector)))
+
+        # Maps an upper case letter to its number value and back. A = 0, B = 1, etc.
+        self._letter_numbers = {chr(letter + ord("A")): letter for letter in range(26)}
+        self._letters = tuple(chr(letter + ord("A")) for letter in range(26))
+
+        # The same for ASCII codes. Maps every byte to the number value of the letter, or -1 if the byte is not a letter.
+        # Lower case letters are wrapped around the alphabet and skip the plugboard, like in encipher().
+        self._byte_numbers = [-1] * 256
+        for letter in range(26):
+            self._byte_numbers[letter + ord("A")] = letter
+            self._byte_numbers[letter + ord("a")] = self._plugboard[(letter + ord("a") - ord("A")) % 26]
+
+        # The whole signal path (plugboard -> rotors -> reflector -> rotors -> plugboard) of a machine state is just
+        # a permutation of the 26 letters. Every permutation that was composed is kept here, up to cache_size states.
+        # The state is offset_1 + 26 * offset_2 + 676 * offset_3. The least recently used state is dropped first.
+        # Only the offsets are in the key, because the rotor order and the plugboard never change in a machine,
+        # and the ring settings do not change the permutation of an offset state.
+        self._cache_size = cache_size
+        self._cache_key = (
+            tuple(rotor.number for rotor in self._rotors),
+            tuple(reflector),
+            self._plugboard,
+        )
+        self._cache = self._new_cache()
+
+    def __repr__(self) -> str:
+        return f"EnigmaMachine rotors {self._rotors}, Positions {self.positions}"
+
+    @staticmethod
+    def _build_offset_tables(rotor: Rotor, is_reversed: bool, tables=None) -> tuple:
+        """
+        Returns the substitution table of a rotor for each one of its 26 offsets (position - setting).
+
+        Args:
+        - rotor (Rotor): The rotor to get the tables for.
+        - is_reversed (bool): True for the tables of the reverse pass (after the reflector).
+        - tables: Precomputed tables to read the rotor tables from. The rotor's own tables if None.
+
+        Returns:
+        - tuple: 26 tables, one per rotor offset. Each table maps a letter (0-25) to the letter that comes out of the rotor.
+        """
+        if tables is not None:
+            return tuple(
+                bytes(tables[start : start + 26])
+                for start in (
+                    shared_tables.rotor_table_start(rotor.number, is_reversed, offset) for offset in range(26)
+                )
+            )
+
+        return rotor.inverse_tables if is_reversed else rotor.forward_tables
+
+    def _to_offsets(self, positions: tuple) -> tuple:
+        """
+        Returns the offsets (position - setting) of the rotors at the given positions.
+        """
+        return tuple((position - setting) % 26 for position, setting in zip(positions, self._settings))
+
+    def _to_positions(self, offsets: tuple) -> tuple:
+        """
+        Returns the positions (0-25) of the rotors at the given offsets.
+        """
+        return tuple((offset + setting) % 26 for offset, setting in zip(offsets, self._settings))
+
+    @property
+    def rotors(self):
+        return self._rotors
+
+    @property
+    def plugboard(self):
+        return self._plugboard
+
+    @property
+    def reflector(self):
+        return self._reflector
+
+    @property
+    def greek_rotor(self):
+        return self._greek_rotor
+
+    @property
+    def positions(self):
+        return self._to_positions(self._offsets)
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def cache_size(self):
+        return self._cache_size
+
+    def set_positions(self, position_1: int, position_2: int, position_3: int) -> None:
+        """
+        Sets the rotors to new positions. The cache is kept, so the next message under the same settings reuses it.
+
+        Args:
+        - position_1 (int): The position of the right most rotor.
+        - position_2 (int): The position of the middle rotor.
+        - position_3 (int): The position of the left rotor.
+        """
+        self._start_positions = (position_1 % 26, position_2 % 26, position_3 % 26)
+        self._offsets = self._to_offsets(self._start_positions)
+
+        for rotor, position in zip(self._rotors, self._start_positions):
+            rotor.position = position
+
+    def seek(self, offset: int) -> None:
+        """
+        Moves the rotors to where they are after the given number of letters from the start positions
+        (the positions the machine was built with, or the last set_positions()).
+        The positions are computed directly, so any part of a long text can be enciphered without enciphering everything before it.
+
+        Only letters turn the rotors, so the offset counts letters and not other chars like spaces.
+
+        Args:
+        - offset (int): How many letters from the start of the message.
+        """
+        notches = tuple(rotor.notches for rotor in self._rotors)
+        self._offsets = self._to_offsets(Rotor.advance_positions(self._start_positions, notches, offset))
+
+        self._sync_rotors()
+
+    def clear_cache(self) -> None:
+        """
+        Empties the permutation cache. A cache shared with other machines is left to them, and this machine starts a new one.
+        """
+        EnigmaMachine._shared_caches.pop(self._cache_key, None)
+        self._cache = self._new_cache()
+
+    @classmethod
+    def _shared_cores_of(cls, key: tuple) -> dict:
+        """
+        Returns the shared cores of the machines with the same middle rotor, left rotor and reflector.
+        The least recently used key is dropped when there are more than SHARED_CORES_LIMIT. The machines that use its cores keep them.
+
+        Args:
+        - key (tuple): (middle rotor number, left rotor number, reflector).
+
+        Returns:
+        - dict: {offset_2 + 26 * offset_3: core}
+        """
+        cores = cls._shared_cores.get(key)
+
+        if cores is None:
+            cores = cls._shared_cores[key] = {}
+            if len(cls._shared_cores) > cls.SHARED_CORES_LIMIT:
+                cls._shared_cores.popitem(last=False)
+        else:
+            cls._shared_cores.move_to_end(key)
+
+        return cores
+
+    def _new_cache(self):
+        """
+        Returns an empty permutation cache.
+        An OrderedDict that keeps the least recently used order, or a list with a slot for every state if all the states fit.
+        A list is shared with the other machines that have the same rotors, reflector and plugboard.
+        """
+        if self._cache_size >= 26**3:
+            cache = EnigmaMachine._shared_caches.get(self._cache_key)
+            if cache is None:
+                cache = _StateCache([None] * 26**3)
+                EnigmaMachine._shared_caches[self._cache_key] = cache
+            return cache
+        return OrderedDict()
+
+    def _core(self, offset_2: int, offset_3: int) -> list:
+        """
+        Returns the core permutation at the given middle and left rotor offsets.
+        The core is: middle rotor -> left rotor -> reflector -> left rotor in reverse -> middle rotor in reverse.
+        Like the reflector, the core is its own inverse, so the same table serves both directions.
+
+        Args:
+        - offset_2 (int): The offset (position - setting) of the middle rotor.
+        - offset_3 (int): The offset (position - setting) of the left rotor.
+
+        Returns:
+        - list: core[letter] is the letter that comes back out of the middle rotor.
+        """
+        core_index = offset_2 + 26 * offset_3
+        core = self._cores.get(core_index)
+
+        if core is None and self._tables is not None:
+            # Read the core from the precomputed tables
+            start = shared_tables.core_table_start(
+                self._tables_rotors_count, self._rotors[1].number, self._rotors[2].number, offset_2, offset_3
+            )
+            core = bytes(self._tables[start : start + 26])
+            self._cores[core_index] = core
+
+        if core is None:
+            reflector = self._reflector
+            forward_2 = self._forward[1][offset_2]
+            forward_3 = self._forward[2][offset_3]
+            inverse_2 = self._inverse[1][offset_2]
+            inverse_3 = self._inverse[2][offset_3]
+
+            core = [
+                inverse_2[inverse_3[reflector[forward_3[forward_2[letter]]]]]
+                for letter in range(26)
+            ]
+            self._cores[core_index] = core
+
+        return core
+
+    def permutation(self, position_1: int, position_2: int, position_3: int) -> tuple:
+        """
+        Composes the whole signal path of the machine at the given rotor positions into one permutation.
+
+        Args:
+        - position_1 (int): The position of the right most rotor.
+        - position_2 (int): The position of the middle rotor.
+        - position_3 (int): The position of the left rotor.
+
+        Returns:
+        - tuple: permutation[letter] is the enciphered letter, plugboard included on both sides.
+        """
+        return self._offset_permutation(*self._to_offsets((position_1, position_2, position_3)))
+
+    def state_cycles(self) -> list[tuple[list, list]]:
+        """
+        Walks the rotors through their states in the order they turn, and composes the permutation of every state once.
+        The attacks that try every start position read the states of every letter from here. See : bombe.run_bombe()
+
+        With one notch per rotor, the rotors turn like an odometer and go through all the 26 * 26 * 26 states in one cycle.
+        A rotor with two notches (VI-VIII) turns the next one twice per turn, so the states split into 2 or 4 shorter cycles.
+        Every state is on exactly one cycle, so the cycles are walked until every state was seen.
+
+        Returns:
+        - list[tuple[list, list]]: The cycles, as (cycle_positions, cycle_permutations).
+        cycle_positions[i] are the rotor positions before a key press, and cycle_permutations[i] is the permutation
+        the letter of that key press goes through, after the rotors turned. Every cycle goes on from its end back to its start.
+        """
+        notches = tuple(rotor.notches for rotor in self._rotors)
+        seen_states = bytearray(26**3)
+
+        cycles = []
+        for start_state in range(26**3):
+            if seen_states[start_state]:
+                continue
+
+            cycle_positions = []
+            cycle_permutations = []
+            positions = (start_state % 26, start_state // 26 % 26, start_state // 676)
+            state = start_state
+            while not seen_states[state]:
+                seen_states[state] = True
+                cycle_positions.append(positions)
+                positions = Rotor.advance_positions(positions, notches, 1)
+                cycle_permutations.append(self.permutation(*positions))
+                state = positions[0] + 26 * positions[1] + 676 * positions[2]
+
+            cycles.append((cycle_positions, cycle_permutations))
+
+        return cycles
+
+    def _offset_permutation(self, offset_1: int, offset_2: int, offset_3: int) -> tuple:
+        """
+        Same as permutation(), at the given rotor offsets (position - setting).
+        """
+        core = self._core(offset_2, offset_3)
+        entry_table = self._entry_tables[offset_1]
+        exit_table = self._exit_tables[offset_1]
+
+        return tuple(exit_table[core[entry_table[letter]]] for letter in range(26))
+
+    def encipher(self, text: str) -> str:
+        """
+        Encrypts the given text using the Enigma machine.
+        It is a drop-in replacement for ciphering_algorithm.encipher(), with the machine state kept between calls.
+
+        Args:
+            text (str): The text to be encrypted.
+
+        Returns:
+            str: The encrypted text.
+        """
+        if self._cache_size > 0:
+            enciphered_chars = self._encipher_with_cache(text)
+        else:
+            enciphered_chars = self._encipher_through_tables(text)
+
+        self._sync_rotors()
+
+        return "".join(enciphered_chars)
+
+    def encipher_bytes(self, data: bytes) -> bytes:
+        """
+        Encrypts ASCII bytes using the Enigma machine.
+        Letters (A-Z and a-z) are enciphered like encipher() does, and every other byte is kept as it is.
+
+        Args:
+            data (bytes): The bytes to be encrypted.
+
+        Returns:
+            bytes: The encrypted bytes.
+        """
+        enciphered_data = bytes(self._encipher_block(data))
+
+        self._sync_rotors()
+
+        return enciphered_data
+
+    def encipher_into(self, source, target, block_size: int = 1 << 20) -> None:
+        """
+        Enciphers an ASCII buffer into another buffer of the same size.
+        Letters (A-Z and a-z) are enciphered like encipher() does, and every other byte is copied as it is.
+        Works on any buffer, like bytes, bytearray, memoryview or mmap, so big files never become Python strings.
+
+        Args:
+        - source: The buffer to read from.
+        - target: A writable buffer of the same size to write the result to. It can be the source itself.
+        - block_size (int): How many bytes to work on at once.
+        """
+        source = memoryview(source)
+        target = memoryview(target)
+
+        for start in range(0, len(source), block_size):
+            end = min(start + block_size, len(source))
+            target[start:end] = self._encipher_block(source[start:end])
+
+        self._sync_rotors()
+
+    def _encipher_block(self, block) -> bytearray:
+        """
+        Enciphers one block of ASCII bytes.
+
+        Args:
+        - block: The bytes to encipher.
+
+        Returns:
+        - bytearray: The enciphered bytes.
+        """
+        # Local names are faster to look up than attributes inside the loop
+        byte_numbers = self._byte_numbers
+        entry_tables = self._entry_tables
+        exit_code_tables = self._exit_code_tables
+        get_core = self._core
+        turnover_1, turnover_2 = self._turnovers[:2]
+        offset_1, offset_2, offset_3 = self._offsets
+        core = get_core(offset_2, offset_3)
+
+        # The output is allocated once. Every byte that is not a letter stays as it is, so start from a copy and only overwrite the letters.
+        enciphered_block = bytearray(block)
+
+        for index, code in enumerate(enciphered_block):
+            letter = byte_numbers[code]
+
+            if letter < 0:
+                continue
+
+            # Turn the rotors. Same rules as Rotor.rotor_turn(), with the notches as offsets
+            offset_1 = (offset_1 + 1) % 26
+            if turnover_1[offset_1]:
+                offset_2 = (offset_2 + 1) % 26
+                if turnover_2[offset_2]:
+                    offset_3 = (offset_3 + 1) % 26
+
+                # The middle rotor turned, so the core changed
+                core = get_core(offset_2, offset_3)
+
+            enciphered_block[index] = exit_code_tables[offset_1][core[entry_tables[offset_1][letter]]]
+
+        self._offsets = (offset_1, offset_2, offset_3)
+
+        return enciphered_block
+
+    def _sync_rotors(self) -> None:
+        """
+        Keeps the Rotor objects in sync with the machine, the same way the per letter algorithm leaves them.
+        """
+        for rotor, position in zip(self._rotors, self.positions):
+            if rotor.position % 26 != position:
+                rotor.position = position
+
+    def _encipher_through_tables(self, text: str) -> list:
+        """
+        Enciphers the text by passing every letter through the right most rotor tables and the current core.
+
+        Args:
+        - text (str): The text to be encrypted.
+
+        Returns:
+        - list: The enciphered chars.
+        """
+        # Local names are faster to look up than attributes inside the loop
+        letter_numbers = self._letter_numbers
+        letters = self._letters
+        plugboard = self._plugboard
+        entry_tables = self._entry_tables
+        exit_tables = self._exit_tables
+        get_core = self._core
+        turnover_1, turnover_2 = self._turnovers[:2]
+        offset_1, offset_2, offset_3 = self._offsets
+        core = get_core(offset_2, offset_3)
+
+        # Stores the chars after they went through the Enigma machine
+        enciphered_chars = []
+        append = enciphered_chars.append
+
+        for char in text:
+            letter = letter_numbers.get(char)
+
+            if letter is None:
+                if not char.isalpha():
+                    # If not a letter then just append the char as it is
+                    append(char)
+                    continue
+
+                # Any other letter is wrapped around the alphabet and skips the plugboard,
+                # exactly like it does in ciphering_algorithm.enigma_machine().
+                # The plugboard is its own inverse, so swapping the letter here cancels the plugboard in the entry table.
+                letter = plugboard[(ord(char) - ord("A")) % 26]
+
+            # Turn the rotors. Same rules as Rotor.rotor_turn(), with the notches as offsets
+            offset_1 = (offset_1 + 1) % 26
+            if turnover_1[offset_1]:
+                offset_2 = (offset_2 + 1) % 26
+                if turnover_2[offset_2]:
+                    offset_3 = (offset_3 + 1) % 26
+
+                # The middle rotor turned, so the core changed
+                core = get_core(offset_2, offset_3)
+
+            # Plugboard and right most rotor, the core, then the right most rotor and the plugboard again
+            append(letters[exit_tables[offset_1][core[entry_tables[offset_1][letter]]]])
+
+        self._offsets = (offset_1, offset_2, offset_3)
+
+        return enciphered_chars
+
+    def _encipher_with_cache(self, text: str) -> list:
+        """
+        Enciphers the text using one cached permutation per machine state.
+        A state that was seen before costs a single lookup. A new state is composed once and cached.
+
+        Args:
+        - text (str): The text to be encrypted.
+
+        Returns:
+        - list: The enciphered chars.
+        """
+        # Local names are faster to look up than attributes inside the loop
+        letter_numbers = self._letter_numbers
+        letters = self._letters
+        plugboard = self._plugboard
+        cache = self._cache
+        cache_size = self._cache_size
+        # A cache with room for all the 26 * 26 * 26 states never drops anything, so it is a plain list without the LRU bookkeeping
+        is_bounded = isinstance(cache, OrderedDict)
+        compose_permutation = self._offset_permutation
+        turnover_1, turnover_2 = self._turnovers[:2]
+        offset_1, offset_2, offset_3 = self._offsets
+
+        # Stores the chars after they went through the Enigma machine
+        enciphered_chars = []
+        append = enciphered_chars.append
+
+        for char in text:
+            # The permutations start with the plugboard, so the letter goes in as it is
+            letter = letter_numbers.get(char)
+
+            if letter is None:
+                if not char.isalpha():
+                    # If not a letter then just append the char as it is
+                    append(char)
+                    continue
+
+                # Any other letter is wrapped around the alphabet and skips the plugboard,
+                # exactly like it does in ciphering_algorithm.enigma_machine().
+                # The plugboard is its own inverse, so swapping the letter here cancels the plugboard in the permutation.
+                letter = plugboard[(ord(char) - ord("A")) % 26]
+
+            # Turn the rotors. Same rules as Rotor.rotor_turn(), with the notches as offsets
+            offset_1 = (offset_1 + 1) % 26
+            if turnover_1[offset_1]:
+                offset_2 = (offset_2 + 1) % 26
+                if turnover_2[offset_2]:
+                    offset_3 = (offset_3 + 1) % 26
+
+            state = offset_1 + 26 * offset_2 + 676 * offset_3
+
+            if is_bounded:
+                permutation = cache.get(state)
+
+                if permutation is None:
+                    # First time in this state. Compose it and drop the least recently used state if the cache is full.
+                    permutation = compose_permutation(offset_1, offset_2, offset_3)
+                    cache[state] = permutation
+                    if len(cache) > cache_size:
+                        cache.popitem(last=False)
+                else:
+                    cache.move_to_end(state)
+            else:
+                permutation = cache[state]
+
+                if permutation is None:
+                    # First time in this state. Every state fits in the cache, so nothing is ever dropped.
+                    permutation = compose_permutation(offset_1, offset_2, offset_3)
+                    cache[state] = permutation
+
+            append(letters[permutation[letter]])
+
+        self._offsets = (offset_1, offset_2, offset_3)
+
+        return enciphered_chars
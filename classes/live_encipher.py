@@ -0,0 +1,107 @@
+"""
+This is the class that enciphers the text of the GUI while it is typed.
+It keeps the machine and the enciphered text between key presses, so only what changed is enciphered again.
+"""
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import ciphering_algorithm
+
+
+class LiveEncipher:
+    """
+    This class enciphers a text that keeps changing, like the input box of the GUI, one edit at a time.
+
+    Every call to update() gets the whole text. The text before the first changed char was already enciphered,
+    and with the same start positions it enciphers the same way, so only the rest is enciphered again.
+    The machine state at any char only depends on the number of letters before it,
+    so the machine jumps there with EnigmaMachine.seek() instead of keeping a snapshot of every state.
+    When the text only grew at the end, the machine is already where the last char left it and just carries on.
+
+    Attributes:
+    - machine (EnigmaMachine): The machine, built once from the rotors and the plugboard.
+    - text (str): The text that was enciphered last.
+    - enciphered_text (str): The enciphered text. Every char is at the same index as in the text.
+
+    Methods:
+    - update(text: str) -> tuple[int, str]:
+        Enciphers the new text. Returns the index of the first changed char and the enciphered text from there.
+    """
+
+    def __init__(
+        self,
+        rotor_1: Rotor,
+        rotor_2: Rotor,
+        rotor_3: Rotor,
+        plugboard_settings: list[int, int],
+    ):
+        self._machine = EnigmaMachine(rotor_1, rotor_2, rotor_3, plugboard_settings)
+
+        # The text that was enciphered last, and what it was enciphered into
+        self._text = ""
+        self._enciphered_text = ""
+
+        # How many letters there are in self._text, so the machine is at this many letters from the start positions
+        self._letters_count = 0
+
+    @property
+    def machine(self):
+        return self._machine
+
+    @property
+    def text(self):
+        return self._text
+
+    @property
+    def enciphered_text(self):
+        return self._enciphered_text
+
+    def update(self, text: str) -> tuple[int, str]:
+        """
+        Enciphers the new text, starting from the first char that is not the same as in the last text.
+
+        Args:
+        - text (str): The whole new text.
+
+        Returns:
+        - tuple[int, str]: The index of the first changed char, and the enciphered text from that index to the end.
+        Everything before the index is the same as in the last enciphered text.
+        """
+        # The first char that changed. Everything before it is enciphered already.
+        first_changed = self._common_prefix_length(self._text, text)
+
+        if first_changed < len(self._text):
+            # An edit before the end. Move the machine back to the letter the edit starts at.
+            self._letters_count -= ciphering_algorithm.count_letters(self._text[first_changed:])
+            self._machine.seek(self._letters_count)
+
+        new_text = text[first_changed:]
+        enciphered_tail = self._machine.encipher(new_text)
+
+        self._letters_count += ciphering_algorithm.count_letters(new_text)
+        self._text = text
+        self._enciphered_text = self._enciphered_text[:first_changed] + enciphered_tail
+
+        return first_changed, enciphered_tail
+
+    @staticmethod
+    def _common_prefix_length(old_text: str, new_text: str) -> int:
+        """
+        Returns how many chars the two texts have the same at the start.
+        """
+        length = min(len(old_text), len(new_text))
+
+        # Most edits are at the end, so check that first. Comparing strings runs in C.
+        if old_text[:length] == new_text[:length]:
+            return length
+
+        # Binary search for the first different char, comparing whole halves at once
+        low, high = 0, length
+        while low < high:
+            middle = (low + high + 1) // 2
+            if old_text[:middle] == new_text[:middle]:
+                low = middle
+            else:
+                high = middle - 1
+
+        return low
@@ -3,7 +3,7 @@ This is the class that defines the rotor for the Enigma machine.
 It is based on the Enigma I machine, which where the most common configuration during WW2.
 """
 
-import sys
+from src import components
 
 
 class Rotor:
@@ -11,9 +11,15 @@ class Rotor:
     This class defines a rotor for the Enigma machine based on the Enigma I machine.
 
     Attributes:
-    - number (int): Rotor number 1-5. Only 3 rotors are allowed at once. 5 rotors are available to choose from.
-    - wiring (list): Rotor wiring as an array.
-    - notch (int): Rotor notch (the letter that triggers rotor turnover).
+    - number (int): Rotor number 1-8. Only 3 rotors are allowed at once. 8 rotors are available to choose from.
+    Or "Beta" or "Gamma" for the Greek wheel of the M4, the fourth rotor that never turns.
+    - wiring (tuple): Rotor wiring as an array. Shared by all the rotors with the same number.
+    - inverse_wiring (tuple): The wiring in reverse. inverse_wiring[wiring[letter]] == letter.
+    - forward_tables (tuple): The wiring for each of the 26 offsets (position - setting), letter in -> letter out.
+    - inverse_tables (tuple): Same as forward_tables, for the reverse pass after the reflector.
+    - notch (int): Rotor notch (the letter that triggers rotor turnover). The first notch for rotors with two notches.
+    None for the Greek wheels.
+    - notches (tuple): All the notches of the rotor. Rotors VI-VIII have two. The Greek wheels have none.
     - setting (int): Rotor setting (offset on the letter using the Caesar cipher).
     - position (int): Rotor position (the letter that the rotor is currently at 0-25).
 
@@ -21,27 +27,51 @@ class Rotor:
     - rotor_turn(rotors: list) -> None:
         Rotates the rotors based on certain conditions. Internal method.
 
-    - set_wiring(rotor_number: int) -> list:
+    - rotor_advance(rotors: list, steps: int) -> None:
+        Rotates the rotors as if rotor_turn() was called the given number of times, without turning them one step at a time.
+
+    - advance_positions(positions: tuple, notches: tuple, steps: int) -> tuple:
+        Returns the positions of the rotors after the given number of steps. Internal method.
+
+    - set_wiring(rotor_number: int) -> tuple:
         Returns the wiring configuration for the specified rotor number.
 
     - set_notch(rotor_number: int) -> int:
         Returns the notch position for the specified rotor number.
 
+    - build_offset_tables(wiring: list) -> tuple:
+        Returns the wiring tables for each of the 26 offsets. Internal method.
+
     Properties:
-    - wiring (list): Get the rotor wiring configuration.
+    - wiring (tuple): Get the rotor wiring configuration.
+    - inverse_wiring (tuple): Get the reversed rotor wiring configuration.
+    - forward_tables (tuple): Get the forward wiring tables for all the offsets.
+    - inverse_tables (tuple): Get the reverse wiring tables for all the offsets.
     - number (int): Get or set the rotor number.
     - notch (int): Get or set the rotor notch.
+    - notches (tuple): Get the rotor notches.
     - setting (int): Get or set the rotor setting.
     - position (int): Get or set the rotor position.
     """
 
+    # A rotor only keeps what is its own. The wiring and its tables only depend on the rotor number,
+    # so they come from the component registry and are shared by all the Rotor instances. See : components.ROTORS
+    # No per instance __dict__, so a rotor is small and its attributes are fast to get.
+    __slots__ = ("_number", "_component", "_notch", "_notches", "_setting", "_position")
+
     def __init__(self, number: int, setting: int, position: int):
-        # Rotor number 1-5. Only 3 rotors are allowed at once. 5 rotors are available to choose from.
+        # Everything is checked once here, so the rotors can be turned later without checking anything.
+        # The setters run the same checks. See : _checked_component(), _checked_setting() and _checked_position()
+        component = self._checked_component(number)
+        setting = self._checked_setting(setting, number)
+        position = self._checked_position(position, number)
+
         self._number = number
-        # Rotor wiring as an array
-        self._wiring = self.set_wiring(number)
-        # Rotor notch (the letter that the rotor will turn)
-        self._notch = self.set_notch(number)
+        # The wiring, its tables and the notches of the rotor
+        self._component = component
+        # Rotor notches (the letters that the rotor will turn the next rotor at)
+        self._notches = component.notches
+        self._notch = component.notches[0] if component.notches else None
         # Rotor setting (offset on the letter using the caesar cipher)
         self._setting = setting
         # Rotor position (the letter that the rotor is currently at 0-25)
@@ -54,9 +84,10 @@ class Rotor:
     def rotor_turn(cls, rotors: list) -> None:
         """
         Rotates the rotors in the provided list based on certain conditions.
+        Only the first 3 rotors turn. A fourth rotor, the Greek wheel of the M4, stays where it was set.
 
         Args:
-        - rotors (list): A list of rotor objects to be rotated.
+        - rotors (list): A list of rotor objects to be rotated. 3 rotors, or 4 for the M4.
         """
 
         def get_new_rotor_position(rotors: list, rotor_number: int) -> None:
@@ -69,7 +100,7 @@ class Rotor:
             """
 
             # Get the rotor current position.
-            rotor_position = rotors[rotor_number].position
+            rotor_position = rotors[rotor_number]._position
 
             # Increment the rotor position by one.
             rotor_position += 1
@@ -78,8 +109,9 @@ class Rotor:
             if rotor_position > 25:
                 rotor_position %= 26
 
-            # Set the new rotor position to the rotor
-            rotors[rotor_number].position = rotor_position
+            # Set the new rotor position to the rotor.
+            # The position is always 0-25 here, so it skips the checks of the position setter.
+            rotors[rotor_number]._position = rotor_position
 
         # rotors[0] is the first rotor. rotors[1] is the second rotor, and rotors[2] is the third rotor.
 
@@ -97,7 +129,7 @@ class Rotor:
         The third rotor should only move when the second rotor has moved a full circle.
         """
 
-        if rotors[0].position == rotors[0].notch:
+        if rotors[0].position in rotors[0].notches:
             first_rotor_reached_notch = True
         else:
             first_rotor_reached_notch = False
@@ -109,7 +141,7 @@ class Rotor:
 
         # Tracks if the second rotor has reached the notch. This is used to determine if the third rotor can move or not.
         # For more info look at the docstring right above
-        if rotors[1].position == rotors[1].notch:
+        if rotors[1].position in rotors[1].notches:
             second_rotor_reached_notch = True
         else:
             second_rotor_reached_notch = False
@@ -119,214 +151,196 @@ class Rotor:
             rotor_number = 2
             get_new_rotor_position(rotors, rotor_number)
 
-    # Wiring setting taken from https://www.cryptomuseum.com/crypto/enigma/wiring.htm for Enigma I machine
-    def set_wiring(self, rotor_number):
+    @classmethod
+    def rotor_advance(cls, rotors: list, steps: int) -> None:
         """
-        Returns the wiring configuration for the specified rotor number.
+        Rotates the rotors in the provided list as if rotor_turn() was called the given number of times.
+        The new positions are computed directly, so it takes the same time for 1 step and for a million steps.
+        Like in rotor_turn(), the Greek wheel of the M4 (a fourth rotor) never turns.
 
         Args:
-        - rotor_number (int): The number of the rotor.
+        - rotors (list): A list of rotor objects to be rotated. 3 rotors, or 4 for the M4.
+        - steps (int): How many key presses to advance the rotors by.
+        """
+        positions = tuple(rotor.position for rotor in rotors[:3])
+        notches = tuple(rotor.notches for rotor in rotors[:3])
+
+        new_positions = cls.advance_positions(positions, notches, steps)
+
+        for rotor, position in zip(rotors, new_positions):
+            if rotor._position % 26 != position:
+                # The new positions are always 0-25, so they skip the checks of the position setter
+                rotor._position = position
+
+    @staticmethod
+    def advance_positions(positions: tuple, notches: tuple, steps: int) -> tuple:
+        """
+        Returns the positions of the rotors after the given number of steps, following the same rules as rotor_turn().
+
+        rotor_turn() works like an odometer: the first rotor moves on every step,
+        the second rotor moves every time the first rotor reaches its notch,
+        and the third rotor moves every time the second rotor reaches its notch.
+        So the number of times each rotor moved can be counted directly.
+
+        Args:
+        - positions (tuple): The current positions of the rotors. positions[0] is the first rotor.
+        - notches (tuple): The notches of every rotor (a tuple of notches per rotor), in the same order.
+        - steps (int): How many key presses to advance the rotors by.
 
         Returns:
-        - list: The wiring configuration for the specified rotor.
+        - tuple: The new positions of the rotors (0-25), in the same order.
         """
+        new_positions = []
 
-        # Set wiring for rotor I
-        if rotor_number == 1:
-            return [
-                4,
-                10,
-                12,
-                5,
-                11,
-                6,
-                3,
-                16,
-                21,
-                25,
-                13,
-                19,
-                14,
-                22,
-                24,
-                7,
-                23,
-                20,
-                18,
-                15,
-                0,
-                8,
-                1,
-                17,
-                2,
-                9,
-            ]
-
-        # Set wiring for rotor II
-        if rotor_number == 2:
-            return [
-                0,
-                9,
-                3,
-                10,
-                18,
-                8,
-                17,
-                20,
-                23,
-                1,
-                11,
-                7,
-                22,
-                19,
-                12,
-                2,
-                16,
-                6,
-                25,
-                13,
-                15,
-                24,
-                5,
-                21,
-                14,
-                4,
-            ]
-
-        # Set wiring for rotor III
-        if rotor_number == 3:
-            return [
-                1,
-                3,
-                5,
-                7,
-                9,
-                11,
-                2,
-                15,
-                17,
-                19,
-                23,
-                21,
-                25,
-                13,
-                24,
-                4,
-                8,
-                22,
-                6,
-                0,
-                10,
-                12,
-                20,
-                18,
-                16,
-                14,
-            ]
-
-        # Set wiring for rotor IV
-        if rotor_number == 4:
-            return [
-                4,
-                18,
-                14,
-                21,
-                15,
-                25,
-                9,
-                0,
-                24,
-                16,
-                20,
-                8,
-                17,
-                7,
-                23,
-                11,
-                13,
-                5,
-                19,
-                6,
-                10,
-                3,
-                2,
-                12,
-                22,
-                1,
-            ]
-
-        # Set wiring for rotor V
-        if rotor_number == 5:
-            return [
-                21,
-                25,
-                1,
-                17,
-                6,
-                8,
-                19,
-                24,
-                20,
-                15,
-                18,
-                3,
-                13,
-                7,
-                11,
-                23,
-                0,
-                22,
-                12,
-                9,
-                16,
-                14,
-                5,
-                4,
-                2,
-                10,
-            ]
-
-        # Error handling
-        else:
-            print(
-                f"RotorSelectionError. Invalid rotor number received when creating a Rotor instance for rotor number {rotor_number}!"
+        for position, rotor_notches in zip(positions, notches):
+            position %= 26
+            new_positions.append((position + steps) % 26)
+
+            # How many times the rotor reached one of its notches, so how many times the next rotor moved.
+            # For every notch: how many steps until the rotor reaches it for the first time (a full turn if it is there already),
+            # then once more every 26 steps.
+            steps = sum(
+                (steps + 26 - ((notch - position) % 26 or 26)) // 26 for notch in rotor_notches
             )
-            sys.exit(1)
 
-    def set_notch(self, rotor_number: int) -> int:
+        return tuple(new_positions)
+
+    @staticmethod
+    def _checked_component(number):
         """
-        Returns the notch position for the specified rotor number.
+        Returns the component of the rotor number, or raises a ValueError if there is no rotor with that number.
+        Rotor number 1-8. Only 3 rotors are allowed at once. 8 rotors are available to choose from.
+        The Greek wheels of the M4 are picked by their name.
+        A ValueError and not an exit, so that the GUI can tell the user and keep running. See : gui_event_handlers.is_valid_settings()
 
         Args:
-        - rotor_number (int): The number of the rotor.
+        - number (int): The rotor number 1-8, or "Beta" or "Gamma".
 
         Returns:
-        - int: The notch position for the specified rotor.
+        - RotorComponent: The wiring, its tables and the notches of the rotor. See : components.ROTORS
         """
+        component = components.find_rotor(number)
+        if component is None:
+            raise ValueError(
+                f"RotorSelectionError. Invalid rotor number {number}! "
+                'Valid rotor numbers are 1-8, or "Beta" and "Gamma" for the Greek wheel of the M4.'
+            )
 
-        # Rotor notch for rotor I
-        if rotor_number == 1:
-            return 18
+        return component
 
-        # Rotor notch for rotor II
-        if rotor_number == 2:
-            return 6
+    @staticmethod
+    def _checked_setting(setting: int, number) -> int:
+        """
+        Returns the ring setting if it is 1-26, like on the GUI, or raises a ValueError.
 
-        # Rotor notch for rotor III
-        if rotor_number == 3:
-            return 23
+        Args:
+        - setting (int): The ring setting.
+        - number (int): The rotor number, for the error message.
+
+        Returns:
+        - int: The ring setting.
+        """
+        if not 1 <= setting <= 26:
+            raise ValueError(
+                f"RotorSettingError. Invalid rotor setting {setting} for rotor number {number}! Valid rotor settings are 1-26."
+            )
+
+        return setting
+
+    @staticmethod
+    def _checked_position(position: int, number) -> int:
+        """
+        Returns the position if it is 0-26, or raises a ValueError.
+        Position 26 behaves exactly like position 0, so the GUI can count the letters from 1.
+
+        Args:
+        - position (int): The rotor position.
+        - number (int): The rotor number, for the error message.
+
+        Returns:
+        - int: The rotor position.
+        """
+        if not 0 <= position <= 26:
+            raise ValueError(
+                f"RotorPositionError. Invalid rotor position {position} for rotor number {number}! Valid rotor positions are 0-26."
+            )
+
+        return position
+
+    @staticmethod
+    def _checked_notch(notch: int, number) -> int:
+        """
+        Returns the notch if it is a letter 0-25, or raises a ValueError.
 
-        # Rotor notch for rotor IV
-        if rotor_number == 4:
-            return 11
+        Args:
+        - notch (int): The rotor notch.
+        - number (int): The rotor number, for the error message.
+
+        Returns:
+        - int: The rotor notch.
+        """
+        if not 0 <= notch <= 25:
+            raise ValueError(
+                f"RotorNotchError. Invalid rotor notch {notch} for rotor number {number}! Valid rotor notches are 0-25."
+            )
 
-        # Rotor notch for rotor V
-        if rotor_number == 5:
-            return 0
+        return notch
+
+    @staticmethod
+    def build_offset_tables(wiring: list) -> tuple:
+        """
+        Returns the wiring tables for each of the 26 offsets of the rotor. See : components.build_offset_tables()
+
+        Args:
+        - wiring (list): The rotor wiring, or the reversed rotor wiring for the reverse pass.
+
+        Returns:
+        - tuple: 26 tables, one for each offset. Each table maps a letter (0-25) to the letter that comes out of the rotor.
+        """
+        return components.build_offset_tables(wiring)
+
+    def set_wiring(self, rotor_number):
+        """
+        Returns the wiring configuration for the specified rotor number.
+
+        Args:
+        - rotor_number (int): The number of the rotor 1-8, or "Beta" or "Gamma".
+
+        Returns:
+        - tuple: The wiring configuration for the specified rotor. See : components.find_rotor()
+        """
+        return self._checked_component(rotor_number).wiring
+
+    def set_notch(self, rotor_number: int) -> int:
+        """
+        Returns the notch position for the specified rotor number.
+
+        Args:
+        - rotor_number (int): The number of the rotor 1-8, or "Beta" or "Gamma".
+
+        Returns:
+        - int: The notch position for the specified rotor, the first one for rotors with two notches.
+        None for the Greek wheels, that have no notch. See : components.find_rotor()
+        """
+        notches = self._checked_component(rotor_number).notches
+
+        return notches[0] if notches else None
 
     @property
     def wiring(self):
-        return self._wiring
+        return self._component.wiring
+
+    @property
+    def inverse_wiring(self):
+        return self._component.inverse_wiring
+
+    @property
+    def forward_tables(self):
+        return self._component.forward_tables
+
+    @property
+    def inverse_tables(self):
+        return self._component.inverse_tables
 
     @property
     def number(self):
@@ -334,14 +348,12 @@ class Rotor:
 
     @number.setter
     def number(self, value):
-        if value < 1 or value > 5:
-            print(
-                f"RotorSelectionError. Invalid rotor number received when creating a Rotor instance for rotor number {value}!"
-            )
-            print("Valid rotor numbers are 1-5.")
-            sys.exit(1)
-        else:
-            self._number = value
+        component = self._checked_component(value)
+
+        self._number = value
+        self._component = component
+        self._notches = component.notches
+        self._notch = component.notches[0] if component.notches else None
 
     @property
     def notch(self):
@@ -349,14 +361,12 @@ class Rotor:
 
     @notch.setter
     def notch(self, value):
-        if value < 0 or value > 25:
-            print(
-                f"RotorNotchError. Invalid rotor notch received when creating a Rotor instance for rotor number {self.number}!"
-            )
-            print("Valid rotor notches are 0-25.")
-            sys.exit(1)
-        else:
-            self._notch = value
+        self._notch = self._checked_notch(value, self._number)
+        self._notches = (value,)
+
+    @property
+    def notches(self):
+        return self._notches
 
     @property
     def setting(self):
@@ -364,17 +374,8 @@ class Rotor:
 
     @setting.setter
     def setting(self, value):
-        # Ring setting is zero-indexed. 0 = No change, 1 = +1, 2 = +2, etc.
-        value = value - 1
-
-        if value < 0 or value > 25:
-            print(
-                f"RotorSettingError. Invalid rotor setting received when creating a Rotor instance for rotor number {self.number}!"
-            )
-            print("Valid rotor settings are 0-25.")
-            sys.exit(1)
-        else:
-            self._setting = value
+        # Ring setting 1-26, kept as it is given, the same as in __init__()
+        self._setting = self._checked_setting(value, self._number)
 
     @property
     def position(self):
@@ -382,11 +383,4 @@ class Rotor:
 
     @position.setter
     def position(self, value):
-        if value < 0 or value > 25:
-            print(
-                f"RotorPositionError. Invalid rotor position received when creating a Rotor instance for rotor number {self.number}!"
-            )
-            print("Valid rotor positions are 0-25.")
-            sys.exit(1)
-        else:
-            self._position = value
+        self._position = self._checked_position(value, self._number)
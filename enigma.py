@@ -2,23 +2,35 @@
 The main code that runs when trying to encipher using the enigma machine.
 """
 
-from src import ciphering_algorithm
+import sys
+
+from src import ciphering_algorithm, streaming
+from classes.enigma_machine import EnigmaMachine
 from classes.rotor import Rotor
 
 
-def main():
+def main(argv: list[str] = None):
     """
     The `main` function is the entry point of the program.
     It prompts the user to enter a text to be encrypted, initializes the rotor settings and positions,
     and calls the `encipher` function from the `ciphering_algorithm` module to encrypt the input text using the Enigma machine.
 
+    When it is given an input file and an output file (`python enigma.py <input file> <output file>`),
+    it enciphers the whole input file into the output file instead. See : streaming.encipher_file()
+
+    Args:
+        argv (list[str]): The command line arguments, without the program name. sys.argv is used if not given.
+
     Returns:
         None
     """
 
-    input_text = input("Enter the text to be encrypted: ")
-    input_text = input_text.replace("\n", "")
-    input_text = input_text.upper().strip()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) not in (0, 2):
+        print("Usage: python enigma.py [<input file> <output file>]")
+        sys.exit(1)
 
     rotor_1_number = 3
     rotor_1_shift = 12
@@ -53,6 +65,25 @@ def main():
     rotor_2 = Rotor(rotor_2_number, rotor_2_shift, rotor_2_position)
     rotor_3 = Rotor(rotor_3_number, rotor_3_shift, rotor_3_position)
 
+    # File mode. The files are memory-mapped, so they never have to fit in memory.
+    if len(argv) == 2:
+        input_path, output_path = argv
+        machine = EnigmaMachine(rotor_1, rotor_2, rotor_3, plugboard_settings)
+
+        # A missing input file, a folder or a file without permission is not a crash, like every other error of the command line
+        try:
+            file_size = streaming.encipher_file(input_path, output_path, machine)
+        except OSError as error:
+            print(f"FileError. Could not encipher {input_path} into {output_path}: {error.strerror or error}")
+            sys.exit(1)
+
+        print(f"Enciphered {file_size} bytes from {input_path} into {output_path}")
+        return
+
+    input_text = input("Enter the text to be encrypted: ")
+    input_text = input_text.replace("\n", "")
+    input_text = input_text.upper().strip()
+
     result_text = ciphering_algorithm.encipher(
         input_text, rotor_1, rotor_2, rotor_3, plugboard_settings
     )
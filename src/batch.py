@@ -0,0 +1,132 @@
+"""
+This file contains the code that enciphers many messages, each one with its own Enigma settings, in one call.
+
+Messages that share the rotor order, the ring settings and the plugboard only differ in their start positions,
+so they are grouped together and the tables are built once for the whole group.
+With NumPy, all the messages of a group are enciphered together as one array.
+"""
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import numpy_engine
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+def encipher_batch(jobs: list[tuple]) -> list[str]:
+    """
+    Enciphers many messages, each one with its own settings.
+
+    Args:
+    - jobs (list[tuple]): A list of (settings, text) jobs. settings is a (rotor_settings, plugboard_settings) tuple:
+        - rotor_settings (list[list[int, int, int]]): The rotor number, rotor shift and rotor position of every rotor.
+        rotor_settings[0] is the right most rotor, rotor_settings[2] is the left rotor. Same as in gui_event_handlers.initialize_rotors().
+        - plugboard_settings (list[int, int]): The plugboard settings.
+
+    Returns:
+    - list[str]: The enciphered texts, in the same order as the jobs.
+    """
+    enciphered_texts = [None] * len(jobs)
+
+    for group_settings, job_indexes in group_jobs(jobs).items():
+        rotor_numbers_and_shifts, plugboard_pairs = group_settings
+
+        # The positions do not matter here, every message sets its own
+        rotors = [Rotor(number, shift, 0) for number, shift in rotor_numbers_and_shifts]
+        machine = EnigmaMachine(*rotors, [list(pair) for pair in plugboard_pairs])
+
+        start_positions = [
+            [int(position) for _, _, position in jobs[job_index][0][0]] for job_index in job_indexes
+        ]
+        texts = [jobs[job_index][1] for job_index in job_indexes]
+
+        if numpy_engine.is_available() and all(text.isascii() for text in texts):
+            group_results = _encipher_group_vectorized(machine, start_positions, texts)
+        else:
+            group_results = []
+            for positions, text in zip(start_positions, texts):
+                machine.set_positions(*positions)
+                group_results.append(machine.encipher(text))
+
+        for job_index, enciphered_text in zip(job_indexes, group_results):
+            enciphered_texts[job_index] = enciphered_text
+
+    return enciphered_texts
+
+
+def group_jobs(jobs: list[tuple]) -> dict:
+    """
+    Groups the jobs by the settings that need their own tables: the rotor order, the ring settings and the plugboard.
+
+    Args:
+    - jobs (list[tuple]): A list of (settings, text) jobs. See : encipher_batch()
+
+    Returns:
+    - dict: {(rotor numbers and shifts, plugboard pairs): [job indexes]}. The jobs keep their order inside every group.
+    """
+    groups = {}
+
+    for job_index, (settings, _) in enumerate(jobs):
+        rotor_settings, plugboard_settings = settings
+
+        rotor_numbers_and_shifts = tuple(
+            (int(number), int(shift)) for number, shift, _ in rotor_settings
+        )
+        # The order of the pairs, and of the letters inside a pair, makes no difference on the plugboard
+        plugboard_pairs = tuple(sorted(tuple(sorted(pair)) for pair in plugboard_settings))
+
+        groups.setdefault((rotor_numbers_and_shifts, plugboard_pairs), []).append(job_index)
+
+    return groups
+
+
+def _encipher_group_vectorized(
+    machine: EnigmaMachine, start_positions: list[list[int]], texts: list[str]
+) -> list[str]:
+    """
+    Enciphers all the messages of one group together, as one array.
+
+    Args:
+    - machine (EnigmaMachine): The machine of the group. Only its rotors and plugboard are used.
+    - start_positions (list[list[int]]): The start positions of every message.
+    - texts (list[str]): The ASCII texts of the messages.
+
+    Returns:
+    - list[str]: The enciphered texts, in the same order.
+    """
+    text_lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    codes = np.frombuffer("".join(texts).encode("ascii"), dtype=np.uint8)
+    mask = numpy_engine.letter_mask(codes)
+
+    # Which message every letter belongs to, and how many letters every message has
+    message_indexes = np.repeat(np.arange(len(texts)), text_lengths)[mask]
+    letters_counts = np.bincount(message_indexes, minlength=len(texts))
+
+    positions = numpy_engine.message_positions(
+        machine.rotors, np.array(start_positions, dtype=np.int64), letters_counts
+    )
+
+    # Every state the messages go through is composed into a permutation only once,
+    # no matter how many messages or letters go through it
+    states = positions[0] + 26 * positions[1] + 676 * positions[2]
+    unique_states, state_indexes = np.unique(states, return_inverse=True)
+    plugboard = np.asarray(machine.plugboard, dtype=np.intp)
+    permutations = numpy_engine.state_permutations(
+        machine.rotors,
+        (unique_states % 26, unique_states // 26 % 26, unique_states // 676),
+        plugboard,
+    )
+
+    letters = numpy_engine.entry_table(plugboard)[codes[mask]]
+
+    enciphered_codes = codes.copy()
+    enciphered_codes[mask] = permutations[state_indexes.ravel(), letters] + ord("A")
+    enciphered_text = enciphered_codes.tobytes().decode("ascii")
+
+    # Split the result back into the messages
+    text_ends = np.cumsum(text_lengths)
+    return [
+        enciphered_text[end - length : end]
+        for end, length in zip(text_ends.tolist(), text_lengths.tolist())
+    ]
@@ -0,0 +1,221 @@
+"""
+This file contains a Turing-Welchman bombe, the machine that was used at Bletchley Park to find the daily Enigma settings.
+
+The bombe takes a ciphertext and a crib (a piece of plaintext that is known, or guessed, to be in the message)
+and tests every rotor order and every start position. For every one of them it guesses the plugboard partner of one letter
+and follows what the guess implies through the letter "menu" built from the crib.
+A guess that leads to a contradiction is impossible. A start position where a guess survives is a "stop",
+a candidate for the real settings, together with the plugboard pairs that were implied on the way.
+
+The Enigma never enciphers a letter into itself, so the crib must be placed where no letter matches the ciphertext.
+"""
+
+from itertools import permutations
+from typing import NamedTuple
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import enigma_parts, table_store
+
+
+# All the 60 ways to put 3 of the 5 rotors in the machine. (right rotor, middle rotor, left rotor)
+ALL_ROTOR_ORDERS = tuple(permutations(range(1, 6), 3))
+
+
+class BombeStop(NamedTuple):
+    """
+    A start position that survived the bombe.
+
+    Attributes:
+    - rotor_numbers (tuple): The rotor numbers, right most rotor first.
+    - positions (tuple): The rotor positions (0-25) at the start of the message, right most rotor first.
+    - plugboard_pairs (list): The plugboard pairs implied by the crib, as [letter, letter] pairs of number values.
+    """
+
+    rotor_numbers: tuple
+    positions: tuple
+    plugboard_pairs: list
+
+
+def run_bombe(
+    ciphertext: str,
+    crib: str,
+    crib_offset: int = 0,
+    rotor_orders: tuple = ALL_ROTOR_ORDERS,
+    rotor_shifts: tuple = (1, 1, 1),
+    reflector: tuple = enigma_parts.UKW_B_REFLECTOR,
+    tables_path: str = None,
+) -> list[BombeStop]:
+    """
+    Runs the bombe on a ciphertext and a crib.
+
+    Args:
+    - ciphertext (str): The enciphered message. Only its letters are used.
+    - crib (str): Plaintext that is known to be in the message. Only its letters are used.
+    - crib_offset (int): Where the crib starts in the message, counted in letters.
+    - rotor_orders (tuple): The rotor orders to test, as (right rotor, middle rotor, left rotor) numbers. All 60 by default.
+    - rotor_shifts (tuple): The ring settings the stops are reported for, right most rotor first.
+    - reflector (tuple): The reflector wiring. UKW-B by default.
+    - tables_path (str): A table store to read the core tables from instead of composing them. See : table_store.py
+
+    Returns:
+    - list[BombeStop]: Every stop, in the order they were found.
+    An empty list if the crib can not be at crib_offset, because a letter of the crib would be enciphered into itself.
+    """
+    ciphertext = _letter_numbers(ciphertext)
+    crib = _letter_numbers(crib)
+
+    cipher_part = ciphertext[crib_offset : crib_offset + len(crib)]
+    if len(cipher_part) != len(crib) or any(
+        plain == cipher for plain, cipher in zip(crib, cipher_part)
+    ):
+        return []
+
+    menu = build_menu(crib, cipher_part)
+    stops = []
+
+    tables = table_store.open_table_store(tables_path, reflector) if tables_path is not None else None
+
+    for rotor_numbers in rotor_orders:
+        stops.extend(
+            _test_rotor_order(menu, crib_offset, rotor_numbers, rotor_shifts, reflector, tables)
+        )
+
+    if tables is not None:
+        tables.close()
+
+    return stops
+
+
+def build_menu(crib: list[int], cipher_part: list[int]) -> dict:
+    """
+    Builds the bombe menu: every crib letter is connected to the ciphertext letter it was enciphered into.
+
+    Args:
+    - crib (list[int]): The crib letters as number values.
+    - cipher_part (list[int]): The ciphertext letters under the crib, as number values.
+
+    Returns:
+    - dict: {letter: [(connected letter, index in the crib), ...]}. Every connection is in the menu from both sides.
+    """
+    menu = {}
+
+    for index, (plain, cipher) in enumerate(zip(crib, cipher_part)):
+        menu.setdefault(plain, []).append((cipher, index))
+        menu.setdefault(cipher, []).append((plain, index))
+
+    return menu
+
+
+def _test_rotor_order(
+    menu: dict,
+    crib_offset: int,
+    rotor_numbers: tuple,
+    rotor_shifts: tuple,
+    reflector: tuple,
+    tables=None,
+) -> list[BombeStop]:
+    """
+    Tests every start position of one rotor order.
+
+    Args:
+    - menu (dict): The bombe menu. See : build_menu()
+    - crib_offset (int): Where the crib starts in the message, counted in letters.
+    - rotor_numbers (tuple): The rotor numbers, right most rotor first.
+    - rotor_shifts (tuple): The ring settings, right most rotor first.
+    - reflector (tuple): The reflector wiring.
+    - tables: The precomputed tables, or None to compose them.
+
+    Returns:
+    - list[BombeStop]: The stops of this rotor order.
+    """
+    rotors = [Rotor(number, shift, 0) for number, shift in zip(rotor_numbers, rotor_shifts)]
+
+    # The scrambler without the plugboard. The bombe finds the plugboard itself.
+    machine = EnigmaMachine(*rotors, [], reflector=reflector, tables=tables)
+
+    # The rotor states in the order the rotors go through them, with the permutation of every state composed once.
+    # Then the state of crib letter i for the start at cycle index c is simply cycle index c + crib_offset + i.
+    # No + 1 for the first key press: cycle_permutations[c] is already the permutation after the rotors turned from cycle_positions[c].
+    state_cycles = machine.state_cycles()
+
+    # The test register: the letter with the most connections in the menu
+    test_letter = max(menu, key=lambda letter: len(menu[letter]))
+
+    # The menu connections of every letter, as (connected letter, index in the crib)
+    menu_items = {letter: tuple(connections) for letter, connections in menu.items()}
+    crib_length = 1 + max(index for connections in menu.values() for _, index in connections)
+
+    stops = []
+
+    for cycle_positions, cycle_permutations in state_cycles:
+        cycle_length = len(cycle_positions)
+
+        for cycle_index, start_positions in enumerate(cycle_positions):
+            # The scrambler permutation at every crib letter, for this start position
+            first_state = cycle_index + crib_offset
+            scramblers = [
+                cycle_permutations[(first_state + index) % cycle_length] for index in range(crib_length)
+            ]
+
+            for guess in range(26):
+                plugboard_partners = _follow_menu(menu_items, scramblers, test_letter, guess)
+
+                if plugboard_partners is not None:
+                    plugboard_pairs = [
+                        [letter, partner]
+                        for letter, partner in enumerate(plugboard_partners)
+                        if partner > letter
+                    ]
+                    stops.append(BombeStop(tuple(rotor_numbers), start_positions, plugboard_pairs))
+
+    return stops
+
+
+def _follow_menu(menu: dict, scramblers: list, test_letter: int, guess: int):
+    """
+    Follows one plugboard guess through the menu until it is either consistent or leads to a contradiction.
+
+    If letter A is plugged to X, and A is connected to B in the menu at crib index i, then B must be plugged to scramblers[i][X].
+    The plugboard swaps letters in pairs, so A plugged to X also means X is plugged to A (the "diagonal board").
+
+    Args:
+    - menu (dict): {letter: ((connected letter, index in the crib), ...)}.
+    - scramblers (list): The scrambler permutation at every crib index.
+    - test_letter (int): The letter the guess is about.
+    - guess (int): The letter guessed to be plugged to the test letter.
+
+    Returns:
+    - list | None: The plugboard partner of every letter (-1 if unknown), or None if the guess leads to a contradiction.
+    """
+    partners = [-1] * 26
+    implications = [(test_letter, guess)]
+
+    while implications:
+        letter, partner = implications.pop()
+
+        if partners[letter] == partner:
+            continue
+
+        # A letter can only be plugged to one other letter
+        if partners[letter] != -1 or partners[partner] != -1:
+            return None
+
+        partners[letter] = partner
+        partners[partner] = letter
+
+        # Follow the menu from both letters of the new pair
+        for connected_letter, index in menu.get(letter, ()):
+            implications.append((connected_letter, scramblers[index][partner]))
+        if partner != letter:
+            for connected_letter, index in menu.get(partner, ()):
+                implications.append((connected_letter, scramblers[index][letter]))
+
+    return partners
+
+
+def _letter_numbers(text: str) -> list[int]:
+    """
+    Returns the letters of the text as number values. A = 0, B = 1, etc. Any other char is left out.
+    """
+    return [ord(char) - ord("A") for char in text.upper() if "A" <= char <= "Z"]
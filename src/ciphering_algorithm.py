@@ -2,8 +2,19 @@
 This files contains all the code that ciphers the text according to the Enigma cipher
 """
 
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from classes.enigma_machine import EnigmaMachine
 from classes.rotor import Rotor
 from src import enigma_parts
+from src.shared_tables import SharedTables
+
+
+# The shared tables a worker process of encipher_in_parallel() is attached to. See : _attach_tables()
+_worker_tables = None
 
 
 def encipher(
@@ -12,9 +23,15 @@ def encipher(
     rotor_2: Rotor,
     rotor_3: Rotor,
     plugboard_settings: list[int, int],
+    processes: int = 1,
+    chunk_size: int = 1_000_000,
+    greek_rotor: Rotor = None,
+    reflector: tuple = None,
 ) -> str:
     """
     Encrypts the given text using the Enigma machine.
+    With a Greek wheel it is the 4 rotor M4. The Greek wheel never turns, so it is composed with the thin reflector
+    into one reflector table once, and every letter costs the same as on the 3 rotor machine.
 
     Args:
         text (str): The text to be encrypted.
@@ -22,39 +39,181 @@ def encipher(
         rotor_2 (Rotor): The second rotor in the Enigma machine.
         rotor_3 (Rotor): The third rotor in the Enigma machine.
         plugboard_settings (list[int, int]): The plugboard settings.
+        processes (int): How many processes to encrypt with. 1 encrypts in this process. None uses all the CPU cores.
+        chunk_size (int): How many chars every process gets at once, when encrypting with more than one process.
+        greek_rotor (Rotor): The Greek wheel of the M4, Rotor("Beta", ...) or Rotor("Gamma", ...). None for the Enigma I.
+        reflector (tuple): The reflector wiring. UKW-B by default, or UKW-B thin with a Greek wheel.
 
     Returns:
         str: The encrypted text.
     """
-    # Create the plugboard 2D array
-    plugboard, reversed_plugboard = enigma_parts.create_the_plugboard(
-        plugboard_settings
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # Build the machine once. All the tables are computed here and not for every letter.
+    machine = EnigmaMachine(
+        rotor_1, rotor_2, rotor_3, plugboard_settings, reflector=reflector, greek_rotor=greek_rotor
     )
 
-    # Stores the text after it went through the Enigma machine
-    enciphered_text = ""
+    # Only long texts are worth sending to other processes.
+    # They get the reflector the machine was built with, with the Greek wheel already composed into it.
+    if processes > 1 and len(text) > chunk_size:
+        return encipher_in_parallel(
+            text, rotor_1, rotor_2, rotor_3, plugboard_settings, processes, chunk_size, machine.reflector
+        )
+
+    # The machine moves the rotors the same way enigma_machine() does
+    return machine.encipher(text)
 
-    # Loop through each character in the string
-    for char in text:
-        if char.isalpha():
-            # Convert the character to its number value. A = 0, B = 1, etc.
-            letter_int = ord(char) - ord("A")
 
-            # Call the Enigma machine to encrypt the character
-            enciphered_letter = enigma_machine(
-                letter_int, rotor_1, rotor_2, rotor_3, plugboard, reversed_plugboard
-            )
+def encipher_bytes(
+    data: bytes,
+    rotor_1: Rotor,
+    rotor_2: Rotor,
+    rotor_3: Rotor,
+    plugboard_settings: list[int, int],
+) -> bytes:
+    """
+    Encrypts ASCII bytes using the Enigma machine, without decoding them to a string first.
+    Letters (A-Z and a-z) are encrypted exactly like encipher() encrypts them, and every other byte is kept as it is.
+
+    Args:
+        data (bytes): The bytes to be encrypted.
+        rotor_1 (Rotor): The first rotor in the Enigma machine.
+        rotor_2 (Rotor): The second rotor in the Enigma machine.
+        rotor_3 (Rotor): The third rotor in the Enigma machine.
+        plugboard_settings (list[int, int]): The plugboard settings.
+
+    Returns:
+        bytes: The encrypted bytes.
+    """
+    machine = EnigmaMachine(rotor_1, rotor_2, rotor_3, plugboard_settings)
+
+    return machine.encipher_bytes(data)
+
+
+def encipher_in_parallel(
+    text: str,
+    rotor_1: Rotor,
+    rotor_2: Rotor,
+    rotor_3: Rotor,
+    plugboard_settings: list[int, int],
+    processes: int,
+    chunk_size: int,
+    reflector: tuple = enigma_parts.UKW_B_REFLECTOR,
+) -> str:
+    """
+    Encrypts the given text using several processes, and gives the same result as encrypting it in one go.
+
+    The text is split into chunks. The rotor positions at the start of every chunk are computed directly
+    from the number of letters before it (See : EnigmaMachine.seek()), so the chunks do not depend on each other.
+    The chunks are encrypted by a process pool and put back together in order.
+    The rotor and core tables are built once and put in shared memory, and every process reads them from there.
+
+    Args:
+        text (str): The text to be encrypted.
+        rotor_1 (Rotor): The first rotor in the Enigma machine.
+        rotor_2 (Rotor): The second rotor in the Enigma machine.
+        rotor_3 (Rotor): The third rotor in the Enigma machine.
+        plugboard_settings (list[int, int]): The plugboard settings.
+        processes (int): How many processes to encrypt with.
+        chunk_size (int): How many chars every process gets at once.
+        reflector (tuple): The reflector wiring. For the M4, the Greek wheel and the thin reflector composed into one table.
+
+    Returns:
+        str: The encrypted text.
+    """
+    rotors = [rotor_1, rotor_2, rotor_3]
 
-            # Convert the number value back to a character and append to the result string
-            char_back = chr(enciphered_letter + ord("A"))
-            enciphered_text += char_back
-        else:
-            # If not a letter then just append the char as it is
-            enciphered_text += char
+    # Rotor objects are sent to the other processes as their settings, so every process can build its own machine
+    rotor_settings = [(rotor.number, rotor.setting, rotor.position) for rotor in rotors]
+
+    chunks = [text[start : start + chunk_size] for start in range(0, len(text), chunk_size)]
+
+    # The number of letters before every chunk. Only letters turn the rotors.
+    letters_before = []
+    letters_count = 0
+    for chunk in chunks:
+        letters_before.append(letters_count)
+        letters_count += count_letters(chunk)
+
+    with SharedTables.create(reflector) as shared_tables, ProcessPoolExecutor(
+        max_workers=processes, initializer=_attach_tables, initargs=(shared_tables.name,)
+    ) as executor:
+        enciphered_chunks = executor.map(
+            _encipher_chunk,
+            chunks,
+            letters_before,
+            repeat(rotor_settings),
+            repeat(plugboard_settings),
+            repeat(reflector),
+        )
+        enciphered_text = "".join(enciphered_chunks)
+
+    # Move the rotors to where they would be after the whole text, like encipher() does
+    Rotor.rotor_advance(rotors, letters_count)
 
     return enciphered_text
 
 
+def _encipher_chunk(
+    chunk: str,
+    letters_before: int,
+    rotor_settings: list[tuple],
+    plugboard_settings: list[int, int],
+    reflector: tuple,
+) -> str:
+    """
+    Encrypts one chunk of a longer text. Runs inside a worker process of encipher_in_parallel().
+
+    Args:
+        chunk (str): The chunk to be encrypted.
+        letters_before (int): How many letters there are in the text before this chunk.
+        rotor_settings (list[tuple]): The rotor number, setting and position of every rotor at the start of the text.
+        plugboard_settings (list[int, int]): The plugboard settings.
+        reflector (tuple): The reflector wiring.
+
+    Returns:
+        str: The encrypted chunk.
+    """
+    rotors = [Rotor(number, setting, position) for number, setting, position in rotor_settings]
+
+    tables = _worker_tables.tables if _worker_tables is not None else None
+
+    machine = EnigmaMachine(*rotors, plugboard_settings, reflector=reflector, tables=tables)
+    machine.seek(letters_before)
+
+    return machine.encipher(chunk)
+
+
+def _attach_tables(name: str) -> None:
+    """
+    Attaches a worker process of encipher_in_parallel() to the shared tables, once when the process starts.
+
+    Args:
+        name (str): The name of the shared memory segment.
+    """
+    global _worker_tables
+    _worker_tables = SharedTables.attach(name)
+
+
+def count_letters(text: str) -> int:
+    """
+    Counts the letters in the text, which is the number of times the rotors turn when it is encrypted.
+
+    Args:
+        text (str): The text to count the letters in.
+
+    Returns:
+        int: The number of letters in the text.
+    """
+    if text.isascii():
+        # str.count() runs in C, so it is much faster than checking every char in Python
+        return sum(text.count(letter) for letter in string.ascii_letters)
+
+    return sum(map(str.isalpha, text))
+
+
 def enigma_machine(
     letter: int,
     rotor_1: Rotor,
@@ -62,6 +221,8 @@ def enigma_machine(
     rotor_3: Rotor,
     plugboard: list[int, int],
     reversed_plugboard: list[int, int],
+    greek_rotor: Rotor = None,
+    reflector: tuple = None,
 ) -> chr:
     """
     Encrypts or decrypts a letter using the Enigma machine.
@@ -75,6 +236,8 @@ def enigma_machine(
     where each element is a pair of integers representing the input and output letters.
     - reversed_plugboard (list[int, int]): A list representing the reverse plugboard configuration,
     where each element is a pair of integers representing the output and input letters.
+    - greek_rotor (Rotor): The Greek wheel of the M4, between the third rotor and the thin reflector. It never turns. None for the Enigma I.
+    - reflector (tuple): The reflector wiring. UKW-B by default, or UKW-B thin with a Greek wheel.
 
     Returns:
     - int: The encrypted or decrypted letter, represented as an integer from 0 to 25.
@@ -95,37 +258,12 @@ def enigma_machine(
 
     rotors = [rotor_1, rotor_2, rotor_3]
 
-    # Create the reflector.
-    # Based on the standard wiring UKW-B reflector in the Enigma I machine
-    # Look : https://www.cryptomuseum.com/crypto/enigma/i
-    reflector = [
-        24,
-        17,
-        20,
-        7,
-        16,
-        18,
-        11,
-        3,
-        15,
-        23,
-        13,
-        6,
-        14,
-        10,
-        12,
-        8,
-        4,
-        1,
-        5,
-        25,
-        2,
-        22,
-        21,
-        9,
-        0,
-        19,
-    ]
+    if greek_rotor is not None:
+        # The M4. The Greek wheel is the fourth rotor, that rotor_turn() never turns
+        rotors.append(greek_rotor)
+
+    if reflector is None:
+        reflector = enigma_parts.UKW_B_REFLECTOR if greek_rotor is None else enigma_parts.UKW_B_THIN_REFLECTOR
 
     """All the steps that a letter goes through in the Enigma machine"""
 
@@ -147,9 +285,15 @@ def enigma_machine(
     # Pass the letter through the third rotor
     letter = enigma_parts.pass_through_rotor(letter, rotor_3, is_reversed)
 
-    # Pass the letter through the reflector
+    # Pass the letter through the Greek wheel, the reflector and the Greek wheel in reverse
+    if greek_rotor is not None:
+        letter = enigma_parts.pass_through_rotor(letter, greek_rotor, is_reversed)
+
     letter = reflector[letter]
 
+    if greek_rotor is not None:
+        letter = enigma_parts.pass_through_rotor(letter, greek_rotor, True)
+
     # Changes to True because now the letter goes in reverse through the rotors
     # See : enigma_parts.py => rotors()
     is_reversed = True
@@ -0,0 +1,332 @@
+"""
+This file contains a ciphertext-only attack on the Enigma, in the style of Gillogly and Weierud-Sullivan.
+Nothing but the ciphertext is needed.
+
+1. Every rotor order and start position is tried without a plugboard, and scored by the index of coincidence.
+   A wrong setting gives random looking text with a low index of coincidence, so the right one tends to score higher.
+2. The ring settings of the best candidates are refined by hill climbing.
+3. The plugboard is built pair by pair by hill climbing, keeping every pair that improves the score.
+
+Every candidate decryption goes through precomputed scrambler permutations instead of through the rotors,
+so a decryption is just a couple of list lookups per letter.
+"""
+
+import heapq
+from typing import Callable, NamedTuple
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import numpy_engine
+from src.bombe import ALL_ROTOR_ORDERS
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+class AttackResult(NamedTuple):
+    """
+    A candidate key found by the attack.
+
+    Attributes:
+    - score (float): The score of the decryption. Higher is better.
+    - rotor_numbers (tuple): The rotor numbers, right most rotor first.
+    - rotor_shifts (tuple): The ring settings, right most rotor first.
+    - positions (tuple): The rotor positions (0-25) at the start of the message, right most rotor first.
+    - plugboard_pairs (list): The plugboard pairs, as [letter, letter] pairs of number values.
+    - plaintext (str): The decrypted message.
+    """
+
+    score: float
+    rotor_numbers: tuple
+    rotor_shifts: tuple
+    positions: tuple
+    plugboard_pairs: list
+    plaintext: str
+
+
+def index_of_coincidence(letters: list[int]) -> float:
+    """
+    Returns the index of coincidence of the letters: the chance that two letters picked at random are the same.
+    Random text scores about 0.038, English and German text about 0.066-0.076.
+
+    Args:
+    - letters (list[int]): The letters as number values (0-25).
+
+    Returns:
+    - float: The index of coincidence.
+    """
+    letters_count = len(letters)
+    if letters_count < 2:
+        return 0.0
+
+    counts = [0] * 26
+    for letter in letters:
+        counts[letter] += 1
+
+    return sum(count * (count - 1) for count in counts) / (letters_count * (letters_count - 1))
+
+
+def index_of_coincidence_array(letters: "np.ndarray") -> "np.ndarray":
+    """
+    Returns the index of coincidence of every row of the letters with NumPy, the same as index_of_coincidence() on every row.
+    The letters are counted one letter value at a time over all the rows at once, so there is no Python loop per row.
+    Shared by this attack and key_search.search_keys().
+
+    Args:
+    - letters (np.ndarray): A 2D array of letter number values (0-25), with one text per row.
+
+    Returns:
+    - np.ndarray: The index of coincidence of every row.
+    """
+    letters_count = letters.shape[1]
+
+    coincidences = np.zeros(letters.shape[0], dtype=np.int64)
+    for letter in range(26):
+        counts = np.count_nonzero(letters == letter, axis=1)
+        coincidences += counts * (counts - 1)
+
+    # Fewer than 2 letters have no coincidence, so they score 0 like in index_of_coincidence()
+    return coincidences / max(letters_count * (letters_count - 1), 1)
+
+
+def ciphertext_only_attack(
+    ciphertext: str,
+    rotor_orders: tuple = ALL_ROTOR_ORDERS,
+    candidates_count: int = 10,
+    max_plugboard_pairs: int = 10,
+    scorer: Callable[[list[int]], float] = index_of_coincidence,
+) -> list[AttackResult]:
+    """
+    Searches for the key of a message from its ciphertext alone.
+
+    Args:
+    - ciphertext (str): The enciphered message. Only its letters are used.
+    - rotor_orders (tuple): The rotor orders to search, as (right rotor, middle rotor, left rotor) numbers. All 60 by default.
+    - candidates_count (int): How many of the best rotor orders and start positions are refined.
+    - max_plugboard_pairs (int): The most plugboard pairs to search for.
+    - scorer (Callable): Scores a decryption (a list of letter number values) for the ring and plugboard hill climbing. Higher is better.
+    The index of coincidence by default. An n-gram scorer (See : ngram_scorer.NgramScorer) works better on short messages.
+
+    Returns:
+    - list[AttackResult]: The refined candidates, the best first.
+    """
+    ciphertext = [ord(char) - ord("A") for char in ciphertext.upper() if "A" <= char <= "Z"]
+
+    # Step 1: every rotor order and start position, with the default ring settings and no plugboard
+    candidates = find_start_candidates(ciphertext, rotor_orders, candidates_count)
+
+    results = []
+    for rotor_numbers, positions in candidates:
+        # Step 2: the ring settings
+        rotor_shifts, positions = _climb_ring_settings(
+            ciphertext, rotor_numbers, (1, 1, 1), positions, scorer
+        )
+
+        # Step 3: the plugboard
+        scramblers = _scramblers(rotor_numbers, rotor_shifts, positions, len(ciphertext))
+        plugboard, score = _climb_plugboard(ciphertext, scramblers, max_plugboard_pairs, scorer)
+
+        plaintext = _decrypt(ciphertext, scramblers, plugboard)
+        results.append(
+            AttackResult(
+                score,
+                tuple(rotor_numbers),
+                rotor_shifts,
+                positions,
+                [[letter, partner] for letter, partner in enumerate(plugboard) if partner > letter],
+                "".join(chr(letter + ord("A")) for letter in plaintext),
+            )
+        )
+
+    results.sort(key=lambda result: result.score, reverse=True)
+
+    return results
+
+
+def find_start_candidates(ciphertext: list[int], rotor_orders: tuple, candidates_count: int) -> list[tuple]:
+    """
+    Decrypts the ciphertext from every start position of every rotor order, without a plugboard,
+    and keeps the ones with the highest index of coincidence.
+
+    Args:
+    - ciphertext (list[int]): The ciphertext letters as number values.
+    - rotor_orders (tuple): The rotor orders to search, right most rotor first.
+    - candidates_count (int): How many candidates to keep.
+
+    Returns:
+    - list[tuple]: The best (rotor numbers, start positions) candidates, the best first.
+    """
+    best = []
+    ciphertext_text = "".join(chr(letter + ord("A")) for letter in ciphertext)
+
+    for rotor_numbers in rotor_orders:
+        rotors = [Rotor(number, 1, 0) for number in rotor_numbers]
+
+        if numpy_engine.is_available():
+            scores = _all_positions_scores(ciphertext_text, rotors)
+        else:
+            scores = all_positions_scores_without_numpy(ciphertext, rotors, [], index_of_coincidence)
+
+        for state, score in enumerate(scores):
+            candidate = (float(score), tuple(rotor_numbers), (state % 26, state // 26 % 26, state // 676))
+            if len(best) < candidates_count:
+                heapq.heappush(best, candidate)
+            elif candidate > best[0]:
+                heapq.heapreplace(best, candidate)
+
+    return [(rotor_numbers, positions) for _, rotor_numbers, positions in sorted(best, reverse=True)]
+
+
+def _all_positions_scores(ciphertext: str, rotors: list[Rotor]) -> "np.ndarray":
+    """
+    Returns the index of coincidence of the decryption from every start position, using NumPy.
+    Row position_1 + 26 * position_2 + 676 * position_3, like numpy_engine.encipher_all_positions().
+    """
+    decryptions = numpy_engine.encipher_all_positions(ciphertext, *rotors, [])
+
+    return index_of_coincidence_array(decryptions - ord("A"))
+
+
+def all_positions_scores_without_numpy(
+    ciphertext: list[int], rotors: list[Rotor], plugboard_settings: list[int, int], scorer: Callable
+) -> list[float]:
+    """
+    Returns the score of the decryption from every start position, in pure Python.
+    The permutation of every state is composed once (See : EnigmaMachine.state_cycles()),
+    and every start position reads its letters' permutations from the cycle it is on.
+    Shared by this attack and key_search.search_keys().
+
+    Args:
+    - ciphertext (list[int]): The ciphertext letters as number values.
+    - rotors (list[Rotor]): The rotors. Their numbers and ring settings are used, and their positions are ignored.
+    - plugboard_settings (list[int, int]): The plugboard settings to decrypt with.
+    - scorer (Callable): Scores a decryption (a list of letter number values). Higher is better.
+
+    Returns:
+    - list[float]: Index position_1 + 26 * position_2 + 676 * position_3, like numpy_engine.encipher_all_positions().
+    """
+    machine = EnigmaMachine(*rotors, plugboard_settings)
+
+    scores = [0.0] * 26**3
+    for cycle_positions, cycle_permutations in machine.state_cycles():
+        cycle_length = len(cycle_positions)
+
+        for cycle_index, positions in enumerate(cycle_positions):
+            decryption = [
+                cycle_permutations[(cycle_index + index) % cycle_length][letter]
+                for index, letter in enumerate(ciphertext)
+            ]
+            scores[positions[0] + 26 * positions[1] + 676 * positions[2]] = scorer(decryption)
+
+    return scores
+
+
+def _scramblers(rotor_numbers: tuple, rotor_shifts: tuple, positions: tuple, letters_count: int) -> list[tuple]:
+    """
+    Returns the scrambler permutation (the machine without the plugboard) of every letter of the message.
+    """
+    rotors = [
+        Rotor(number, shift, position)
+        for number, shift, position in zip(rotor_numbers, rotor_shifts, positions)
+    ]
+    machine = EnigmaMachine(*rotors, [])
+    notches = tuple(rotor.notches for rotor in rotors)
+
+    scramblers = []
+    for _ in range(letters_count):
+        positions = Rotor.advance_positions(positions, notches, 1)
+        scramblers.append(machine.permutation(*positions))
+
+    return scramblers
+
+
+def _decrypt(ciphertext: list[int], scramblers: list[tuple], plugboard: list[int]) -> list[int]:
+    """
+    Decrypts the ciphertext with precomputed scramblers and a plugboard table: plugboard, scrambler, plugboard.
+    """
+    return [
+        plugboard[scrambler[plugboard[letter]]]
+        for scrambler, letter in zip(scramblers, ciphertext)
+    ]
+
+
+def _climb_ring_settings(
+    ciphertext: list[int],
+    rotor_numbers: tuple,
+    rotor_shifts: tuple,
+    positions: tuple,
+    scorer: Callable,
+) -> tuple:
+    """
+    Refines the ring settings of the right and middle rotors.
+
+    Turning the ring and the position of a rotor by the same amount keeps the wiring where it is,
+    and only changes when the rotor turns the next one. So every ring setting is tried together with the matching position.
+    The left rotor never turns another rotor, so its ring setting makes no difference.
+
+    Returns:
+    - tuple: The best (rotor shifts, positions).
+    """
+    identity = list(range(26))
+    best_score = scorer(
+        _decrypt(ciphertext, _scramblers(rotor_numbers, rotor_shifts, positions, len(ciphertext)), identity)
+    )
+
+    for rotor_index in (0, 1):
+        best_shifts, best_positions = rotor_shifts, positions
+
+        for shift_change in range(1, 26):
+            new_shifts = list(rotor_shifts)
+            new_positions = list(positions)
+            new_shifts[rotor_index] = (rotor_shifts[rotor_index] + shift_change - 1) % 26 + 1
+            new_positions[rotor_index] = (positions[rotor_index] + shift_change) % 26
+
+            scramblers = _scramblers(rotor_numbers, new_shifts, new_positions, len(ciphertext))
+            score = scorer(_decrypt(ciphertext, scramblers, identity))
+
+            if score > best_score:
+                best_score = score
+                best_shifts, best_positions = tuple(new_shifts), tuple(new_positions)
+
+        rotor_shifts, positions = best_shifts, best_positions
+
+    return tuple(rotor_shifts), tuple(positions)
+
+
+def _climb_plugboard(
+    ciphertext: list[int],
+    scramblers: list[tuple],
+    max_plugboard_pairs: int,
+    scorer: Callable,
+) -> tuple:
+    """
+    Builds the plugboard by hill climbing. On every round, every pair of unplugged letters is tried,
+    and the pair that improves the score the most is kept. Stops when no pair helps or the plugboard is full.
+
+    Returns:
+    - tuple: The plugboard as a 26 entry table, and its score.
+    """
+    plugboard = list(range(26))
+    best_score = scorer(_decrypt(ciphertext, scramblers, plugboard))
+
+    for _ in range(max_plugboard_pairs):
+        unplugged = [letter for letter in range(26) if plugboard[letter] == letter]
+        best_pair = None
+
+        for first_index, first in enumerate(unplugged):
+            for second in unplugged[first_index + 1 :]:
+                plugboard[first], plugboard[second] = second, first
+                score = scorer(_decrypt(ciphertext, scramblers, plugboard))
+                plugboard[first], plugboard[second] = first, second
+
+                if score > best_score:
+                    best_score = score
+                    best_pair = (first, second)
+
+        if best_pair is None:
+            break
+
+        first, second = best_pair
+        plugboard[first], plugboard[second] = second, first
+
+    return plugboard, best_score
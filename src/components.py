@@ -0,0 +1,118 @@
+"""
+This file contains the registry of every Enigma component: the rotors, the Greek wheels of the M4 and the reflectors.
+
+Every component is written down once, as the letters its wiring sends A to Z to,
+and turned into the tables the machines use when this file is imported:
+the wiring, the wiring in reverse, the notches, and the wiring tables for all the 26 offsets.
+The tables are tuples, so every Rotor and every machine shares them and none can change them.
+
+Wiring settings taken from https://www.cryptomuseum.com/crypto/enigma/wiring.htm
+"""
+
+from typing import NamedTuple
+
+
+class RotorComponent(NamedTuple):
+    """
+    The precomputed tables of one rotor.
+
+    Attributes:
+    - name (str): The name of the rotor, like "VI" or "Beta".
+    - wiring (tuple): wiring[letter] is the letter the rotor sends it to, at offset 0.
+    - inverse_wiring (tuple): The wiring in reverse. inverse_wiring[wiring[letter]] == letter.
+    - notches (tuple): The positions where the rotor turns the next one. See : Rotor.rotor_turn()
+    Rotors VI to VIII have two notches. The Greek wheels have none, they never turn.
+    - forward_tables (tuple): The wiring for each of the 26 offsets (position - setting), letter in -> letter out.
+    - inverse_tables (tuple): Same as forward_tables, for the reverse pass after the reflector.
+    """
+
+    name: str
+    wiring: tuple
+    inverse_wiring: tuple
+    notches: tuple
+    forward_tables: tuple
+    inverse_tables: tuple
+
+
+def wiring_from_letters(letters: str) -> tuple:
+    """
+    Returns a wiring written as letters ("EKMF...") as number values (4, 10, 12, 5, ...).
+    """
+    return tuple(ord(letter) - ord("A") for letter in letters)
+
+
+def build_offset_tables(wiring: tuple) -> tuple:
+    """
+    Returns the wiring tables for each of the 26 offsets of a rotor.
+
+    The letter that comes out of a rotor only depends on (position - setting) % 26, so there are just 26 different tables.
+    tables[offset][letter] is the same as passing the letter through the rotor in enigma_parts.pass_through_rotor().
+
+    Args:
+    - wiring (tuple): The rotor wiring, or the reversed rotor wiring for the reverse pass.
+
+    Returns:
+    - tuple: 26 tables, one for each offset. Each table maps a letter (0-25) to the letter that comes out of the rotor.
+    """
+    return tuple(
+        tuple((wiring[(letter + offset) % 26] - offset) % 26 for letter in range(26))
+        for offset in range(26)
+    )
+
+
+def _rotor(name: str, letters: str, notches: tuple) -> RotorComponent:
+    """
+    Builds every table of a rotor from its wiring letters.
+    """
+    wiring = wiring_from_letters(letters)
+    inverse_wiring = tuple(sorted(range(26), key=wiring.__getitem__))
+
+    return RotorComponent(
+        name,
+        wiring,
+        inverse_wiring,
+        notches,
+        build_offset_tables(wiring),
+        build_offset_tables(inverse_wiring),
+    )
+
+
+# {rotor_number: RotorComponent}. Rotors I-V of the Enigma I, and rotors VI-VIII of the Kriegsmarine M3 and M4.
+# The notches are where the rotor lands when it turns the next one, like the notches of rotors I-V always were in this machine.
+# Rotors VI-VIII have two notches, at Z and M.
+ROTORS = {
+    1: _rotor("I", "EKMFLGDQVZNTOWYHXUSPAIBRCJ", (18,)),
+    2: _rotor("II", "AJDKSIRUXBLHWTMCQGZNPYFVOE", (6,)),
+    3: _rotor("III", "BDFHJLCPRTXVZNYEIWGAKMUSQO", (23,)),
+    4: _rotor("IV", "ESOVPZJAYQUIRHXLNFTGKDCMWB", (11,)),
+    5: _rotor("V", "VZBRGITYUPSDNHLXAWMJQOFECK", (0,)),
+    6: _rotor("VI", "JPGVOUMFYQBENHZRDKASXLICTW", (1, 14)),
+    7: _rotor("VII", "NZJHGRCXMYSWBOUFAIVLPEKQDT", (1, 14)),
+    8: _rotor("VIII", "FKQHTLXOCBJSPDZRAMEWNIUYGV", (1, 14)),
+}
+
+# {name: RotorComponent}. The Greek wheels of the M4. They sit between the left rotor and the thin reflector and never turn.
+GREEK_ROTORS = {
+    "Beta": _rotor("Beta", "LEYJVCNIXWPBQMDRTAKZGFUHOS", ()),
+    "Gamma": _rotor("Gamma", "FSOKANUERHMBTIYCWLQPZXVGJD", ()),
+}
+
+
+def find_rotor(number) -> RotorComponent:
+    """
+    Returns the tables of a rotor, from its number (1-8) or, for the Greek wheels of the M4, from its name ("Beta" or "Gamma").
+
+    Returns:
+    - RotorComponent: The rotor tables, or None if there is no such rotor.
+    """
+    return ROTORS.get(number) or GREEK_ROTORS.get(number)
+
+
+# {name: wiring}. The reflectors of the 3 rotor machines, and the thin reflectors of the M4.
+REFLECTORS = {
+    "UKW-A": wiring_from_letters("EJMZALYXVBWFCRQUONTSPIKHGD"),
+    "UKW-B": wiring_from_letters("YRUHQSLDPXNGOKMIEBFZCWVJAT"),
+    "UKW-C": wiring_from_letters("FVPJIAOYEDRZXWGCTKUQSBNMHL"),
+    "UKW-B thin": wiring_from_letters("ENKQAUYWJICOPBLMDXZVFTHRGS"),
+    "UKW-C thin": wiring_from_letters("RDOBJNTKVEHMLFCWZAXGYIPSUQ"),
+}
@@ -0,0 +1,138 @@
+"""
+This file contains the crib position finder. It is the first step of any crib based analysis, like the bombe.
+
+The Enigma never enciphers a letter into itself. So a crib (a piece of plaintext that is guessed to be in the message)
+can not be at an offset where any of its letters is the same as the ciphertext letter under it.
+Every other offset is feasible, and is worth testing with the bombe. See : bombe.run_bombe()
+
+With NumPy, every letter of a crib is compared with the ciphertext at all the offsets at once.
+Without it, the ciphertext is turned into one bitset per letter, and a whole crib is checked with a few big integer operations.
+"""
+
+from src import numpy_engine
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+# Every byte that is not an upper case letter, to be deleted from the text with bytes.translate()
+_NOT_LETTERS = bytes(code for code in range(256) if not ord("A") <= code <= ord("Z"))
+
+
+def find_crib_positions(ciphertext: str, cribs: list[str]) -> dict[str, list[int]]:
+    """
+    Finds every offset where each crib could be in the message.
+
+    Args:
+    - ciphertext (str): The enciphered message. Only its letters are used.
+    - cribs (list[str]): The cribs. Only their letters are used.
+
+    Returns:
+    - dict[str, list[int]]: {crib: [feasible offsets]}, the offsets counted in letters from the start of the message,
+    like the crib_offset of bombe.run_bombe().
+    """
+    ciphertext = _letter_codes(ciphertext)
+
+    if numpy_engine.is_available():
+        ciphertext = np.frombuffer(ciphertext, dtype=np.uint8) - ord("A")
+        find_offsets = _feasible_offsets_with_numpy
+    else:
+        ciphertext = _letter_bitsets(ciphertext)
+        find_offsets = _feasible_offsets_with_bitsets
+
+    return {crib: find_offsets(ciphertext, _letter_numbers(crib)) for crib in cribs}
+
+
+def _feasible_offsets_with_numpy(ciphertext: "np.ndarray", crib: list[int]) -> list[int]:
+    """
+    Returns the feasible offsets of one crib, using NumPy.
+    Every crib letter is compared with the ciphertext at all the offsets at once, so there is one array operation per crib letter.
+
+    Args:
+    - ciphertext (np.ndarray): The ciphertext letters as a uint8 array.
+    - crib (list[int]): The crib letters as number values.
+
+    Returns:
+    - list[int]: The feasible offsets.
+    """
+    offsets_count = len(ciphertext) - len(crib) + 1
+    if offsets_count <= 0:
+        return []
+
+    # conflicts[offset] is True if a crib letter is the same as the ciphertext letter under it
+    conflicts = np.zeros(offsets_count, dtype=bool)
+    for index, letter in enumerate(crib):
+        conflicts |= ciphertext[index : index + offsets_count] == letter
+
+    return np.flatnonzero(~conflicts).tolist()
+
+
+def _feasible_offsets_with_bitsets(letter_bitsets: tuple, crib: list[int]) -> list[int]:
+    """
+    Returns the feasible offsets of one crib, in pure Python.
+
+    Bit j of letter_bitsets[letter] is set if the ciphertext letter j is that letter.
+    Shifting the bitset of crib letter i by i lines its bits up with the offsets, so OR-ing all of them
+    gives every offset with a conflict in one pass over the crib.
+
+    Args:
+    - letter_bitsets (tuple): The ciphertext letters, as one bitset per letter and the ciphertext length. See : _letter_bitsets()
+    - crib (list[int]): The crib letters as number values.
+
+    Returns:
+    - list[int]: The feasible offsets.
+    """
+    bitsets, letters_count = letter_bitsets
+    offsets_count = letters_count - len(crib) + 1
+    if offsets_count <= 0:
+        return []
+
+    conflicts = 0
+    for index, letter in enumerate(crib):
+        conflicts |= bitsets[letter] >> index
+
+    feasible = ~conflicts & ((1 << offsets_count) - 1)
+
+    # The set bits of the feasible bitset, read from its binary string. Offset 0 is the last char.
+    bits = format(feasible, f"0{offsets_count}b")[::-1]
+    offsets = []
+    offset = bits.find("1")
+    while offset != -1:
+        offsets.append(offset)
+        offset = bits.find("1", offset + 1)
+
+    return offsets
+
+
+def _letter_bitsets(ciphertext: bytes) -> tuple:
+    """
+    Returns one bitset per letter of the alphabet, with bit j set if ciphertext letter j is that letter, and the ciphertext length.
+
+    Args:
+    - ciphertext (bytes): The ASCII codes of the ciphertext letters, A-Z only.
+    """
+    # Every bitset is built from a binary string made by bytes.translate(), instead of one bit at a time.
+    # The text is reversed, so that the first letter is the lowest bit.
+    reversed_text = ciphertext[::-1]
+
+    bitsets = []
+    for letter in range(26):
+        translation = bytearray(b"0" * 256)
+        translation[letter + ord("A")] = ord("1")
+        bitsets.append(int(reversed_text.translate(translation) or b"0", 2))
+
+    return tuple(bitsets), len(ciphertext)
+
+
+def _letter_codes(text: str) -> bytes:
+    """
+    Returns the ASCII codes of the letters of the text, in upper case. Any other char is left out.
+    """
+    return text.upper().encode("ascii", "ignore").translate(None, _NOT_LETTERS)
+
+
+def _letter_numbers(text: str) -> list[int]:
+    """
+    Returns the letters of the text as number values. A = 0, B = 1, etc. Any other char is left out.
+    """
+    return [ord(char) - ord("A") for char in text.upper() if "A" <= char <= "Z"]
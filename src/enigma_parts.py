@@ -3,6 +3,17 @@ Here is all the parts of the Enigma machine enciphering algorithm
 """
 
 from classes.rotor import Rotor
+from src import components
+
+
+# The reflector.
+# Based on the standard wiring UKW-B reflector in the Enigma I machine
+# Look : https://www.cryptomuseum.com/crypto/enigma/i
+# The other reflectors are in the component registry. See : components.REFLECTORS
+UKW_B_REFLECTOR = components.REFLECTORS["UKW-B"]
+
+# The thin reflector the M4 was used with most of the time. It goes with the Greek wheel, see : create_m4_reflector()
+UKW_B_THIN_REFLECTOR = components.REFLECTORS["UKW-B thin"]
 
 
 def pass_through_plugboard(letter: int, plugboard, reversed_plugboard) -> chr:
@@ -56,6 +67,64 @@ def create_the_plugboard(plugboard_settings: list[int, int]) -> tuple[dict, dict
     return plugboard, reversed_plugboard
 
 
+def create_plugboard_table(plugboard_settings: list[int, int]) -> tuple:
+    """
+    Creates the plugboard as one 26 entry table, so passing a letter through the plugboard is a single lookup.
+
+    The plugboard swaps letters in pairs, so the table is its own inverse: table[table[letter]] == letter.
+    The same table serves both passes through the plugboard, and it can be folded into the rotor tables.
+    A letter can only be in one pair, like a plug can only go into one socket, otherwise the table would not be its own inverse.
+
+    Args:
+        plugboard_settings (list[int, int]): The list of plugboard settings.
+
+    Returns:
+        tuple: table[letter] is the letter it is swapped with, or the letter itself if it has no pair.
+        Same result as pass_through_plugboard() with the dictionaries of create_the_plugboard().
+    """
+    table = list(range(26))
+
+    # Only the pairs of letters. The GUI sends the empty plugboard cells as well, as a pair of spaces,
+    # which the dictionaries of create_the_plugboard() keep but no letter ever goes through.
+    pairs = [(key, value) for key, value in plugboard_settings if 0 <= key < 26 and 0 <= value < 26]
+
+    # A ValueError and not an exit, like the Rotor checks. The GUI checks the plugboard first. See : gui_event_handlers.is_valid_settings()
+    plugged_letters = [letter for pair in pairs for letter in pair]
+    if len(plugged_letters) != len(set(plugged_letters)):
+        raise ValueError(
+            f"PlugboardError. Invalid plugboard settings {pairs}! Every letter can only be in one pair."
+        )
+
+    for key, value in pairs:
+        table[key] = value
+        table[value] = key
+
+    return tuple(table)
+
+
+def create_m4_reflector(greek_rotor: Rotor, thin_reflector: tuple = UKW_B_THIN_REFLECTOR) -> tuple:
+    """
+    Composes the Greek wheel and the thin reflector of the M4 into one reflector table.
+
+    The Greek wheel never turns, so the letter that comes back out of it only depends on its setting and position.
+    Greek wheel -> thin reflector -> Greek wheel in reverse is then a fixed table, like a reflector:
+    it is its own inverse and never maps a letter to itself. An EnigmaMachine built with it enciphers like an M4,
+    at the same cost per letter as the 3 rotor machine.
+
+    Args:
+    - greek_rotor (Rotor): The Greek wheel, Rotor("Beta", ...) or Rotor("Gamma", ...).
+    - thin_reflector (tuple): The thin reflector wiring. UKW-B thin by default.
+
+    Returns:
+    - tuple: table[letter] is the letter that comes back from the Greek wheel and the thin reflector.
+    """
+    offset = (greek_rotor.position - greek_rotor.setting) % 26
+    forward_table = greek_rotor.forward_tables[offset]
+    inverse_table = greek_rotor.inverse_tables[offset]
+
+    return tuple(inverse_table[thin_reflector[forward_table[letter]]] for letter in range(26))
+
+
 def pass_through_rotor(letter: int, rotor: Rotor, is_reversed: bool) -> chr:
     """
     Passes a letter through a rotor, considering the rotor's wiring, offset, and position.
@@ -74,6 +143,7 @@ def pass_through_rotor(letter: int, rotor: Rotor, is_reversed: bool) -> chr:
     - The rotor's wiring, setting, and position are considered in the process.
     """
     rotor_wiring = rotor.wiring
+    rotor_inverse_wiring = rotor.inverse_wiring
     rotor_offset = rotor.setting
     rotor_position = rotor.position
 
@@ -82,8 +152,8 @@ def pass_through_rotor(letter: int, rotor: Rotor, is_reversed: bool) -> chr:
     letter: int = (letter + rotor_position - rotor_offset) % 26
 
     if is_reversed:
-        # If passing in reverse, find the original letter in the wiring
-        result_index = rotor_wiring.index(letter)
+        # If passing in reverse, look up the original letter in the reversed wiring
+        result_index = rotor_inverse_wiring[letter]
     else:
         # Pass through rotor wiring
         result_index = rotor_wiring[letter]
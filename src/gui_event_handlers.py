@@ -3,12 +3,18 @@ Here are event handling functions that are called when an event happens in the G
 """
 
 import tkinter
-from tkinter import Text, ttk
+from tkinter import Text, messagebox, ttk
+from classes.live_encipher import LiveEncipher
 from classes.rotor import Rotor
 from src import ciphering_algorithm
 import webbrowser
 
 
+# The live encipher of the input box, and the settings it was built with. See : live_encipher_text()
+_live_encipher = None
+_live_settings = None
+
+
 def encipher_text(
     input_text: str,
     plugboard_settings: list[int, int],
@@ -56,6 +62,72 @@ def encipher_text(
     display_text(enciphered_text, "black", output_textbox)
 
 
+def live_encipher_text(
+    input_text: str,
+    plugboard_settings: list[int, int],
+    rotor_settings: list[int, int],
+    output_textbox: Text,
+) -> None:
+    """
+    Enciphers the input text while it is typed. Called on every key release in the input box.
+
+    The machine is kept between key presses, so only the text from the first changed char is enciphered again,
+    and only that part of the output box is replaced. See : LiveEncipher
+    The machine is built again when the rotor or plugboard settings change.
+    Unlike encipher_text(), the text is not stripped, so every char of the output is under the same char of the input.
+
+    Args:
+    - input_text (str): The whole text of the input box.
+    - plugboard_settings (list[int, int]): The plugboard settings as a list of pairs of integers representing the connected letters.
+    - rotor_settings (list[list[int, int, int]]): The rotor settings as a list of lists. Each inner list contains the rotor number, rotor shift, and rotor position.
+    - output_textbox (Text): The output text widget where the enciphered text will be displayed.
+
+    Returns:
+    - None
+    """
+    global _live_encipher, _live_settings
+
+    settings = (
+        [list(setting) for setting in rotor_settings],
+        [list(pair) for pair in plugboard_settings],
+    )
+
+    if settings != _live_settings:
+        _live_settings = settings
+        _live_encipher = None
+
+        # If the Enigma settings are not valid then no encryption will be done and the user is told. See : is_valid_settings()
+        # The settings are only checked when they change, so the user is told once and not on every key press.
+        if not is_valid_settings(plugboard_settings, rotor_settings, output_textbox):
+            return
+    elif _live_encipher is None:
+        # The same invalid settings as on the last key press
+        return
+
+    # The output box may have been changed by something else, like the Encipher or Clear buttons
+    output_changed = (
+        _live_encipher is None
+        or output_textbox.get("1.0", "end-1c") != _live_encipher.enciphered_text
+    )
+
+    if output_changed:
+        # Convert letters to numbers. Zero-indexed. A is 0, B is 1, C is 2 etc.
+        numeric_plugboard_settings = [
+            [ord(letter) - ord("A") for letter in sublist] for sublist in plugboard_settings
+        ]
+
+        _live_encipher = LiveEncipher(*initialize_rotors(rotor_settings), numeric_plugboard_settings)
+
+        display_text(_live_encipher.update(input_text.upper())[1], "black", output_textbox)
+        return
+
+    first_changed, enciphered_tail = _live_encipher.update(input_text.upper())
+
+    # Only replace the output from the first changed char
+    output_textbox.delete(f"1.0 + {first_changed} chars", "end-1c")
+    output_textbox.insert("end-1c", enciphered_tail)
+
+
 def display_text(enciphered_text: str, color: str, output_text: Text) -> None:
     """
     Display the output text in the output box
@@ -220,6 +292,29 @@ def get_rotor_settings(
     return rotor_settings
 
 
+def rotor_settings_error(rotor_settings: list[int, int]):
+    """
+    Checks the rotor values taken from the GUI comboboxes, before any Rotor is built with them.
+
+    Args:
+    - rotor_settings (list[list[int, str, str]]): The rotor settings as a list of lists. Each inner list contains the rotor number, rotor shift, and rotor position.
+
+    Returns:
+    - str | None: A message about the first invalid value, or None if every value is valid.
+    """
+    rotor_names = ("Right", "Center", "Left")
+
+    for rotor_name, (number, shift, position) in zip(rotor_names, rotor_settings):
+        if number is None:
+            return f"{rotor_name} rotor: the rotor number must be one of I, II, III, IV, V, VI, VII, VIII."
+
+        for value_name, value in (("ring shift", shift), ("position", position)):
+            if not str(value).strip().isdigit() or not 1 <= int(value) <= 26:
+                return f"{rotor_name} rotor: the {value_name} must be a number from 1 to 26."
+
+    return None
+
+
 # Converts rotor numbers from the roman format to integers
 def rotor_number_roman_to_int(rotor_roman: str) -> int:
     """
@@ -245,6 +340,12 @@ def rotor_number_roman_to_int(rotor_roman: str) -> int:
         return 4
     if rotor_roman == "V":
         return 5
+    if rotor_roman == "VI":
+        return 6
+    if rotor_roman == "VII":
+        return 7
+    if rotor_roman == "VIII":
+        return 8
     else:
         return None
 
@@ -288,6 +389,13 @@ def is_valid_settings(
     - bool: True if the settings are valid, False otherwise.
     """
 
+    """Check if every rotor has a known number, and a ring setting and position of 1-26"""
+    # The comboboxes can be typed into, so a rotor value may be anything. A message box tells the user, and the app keeps running.
+    rotor_error = rotor_settings_error(rotor_settings)
+    if rotor_error is not None:
+        messagebox.showerror("Invalid rotor settings", rotor_error)
+        return False
+
     """Check if there is no two instances of the same rotor number"""
     if len(rotor_settings) != len({tuple(setting) for setting in rotor_settings}):
         # If invalid, display an error message in the output box
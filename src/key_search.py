@@ -0,0 +1,284 @@
+"""
+This file contains a key search that runs on all the CPU cores, and that can be stopped and resumed.
+
+The keyspace is split into work units: one rotor order with one set of ring settings.
+Every work unit tries all the 26 * 26 * 26 start positions, and sends back its best keys.
+The work units run in a process pool, and the best keys of the whole search are kept in one heap.
+
+Every few work units, the search writes a checkpoint file with the work units that are done and the best keys so far.
+If the search is stopped, running it again with the same checkpoint file skips the work units that are already done.
+"""
+
+import heapq
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from typing import Callable, NamedTuple
+
+from classes.rotor import Rotor
+from src import numpy_engine
+from src.bombe import ALL_ROTOR_ORDERS
+from src.ciphertext_only_attack import (
+    all_positions_scores_without_numpy,
+    index_of_coincidence,
+    index_of_coincidence_array,
+)
+
+
+class WorkUnit(NamedTuple):
+    """
+    One part of the keyspace: one rotor order with one set of ring settings, and all the start positions.
+
+    Attributes:
+    - rotor_numbers (tuple): The rotor numbers, right most rotor first.
+    - rotor_shifts (tuple): The ring settings (1-26), right most rotor first.
+    """
+
+    rotor_numbers: tuple
+    rotor_shifts: tuple
+
+
+class SearchResult(NamedTuple):
+    """
+    A key found by the search.
+
+    Attributes:
+    - score (float): The score of the decryption. Higher is better.
+    - rotor_numbers (tuple): The rotor numbers, right most rotor first.
+    - rotor_shifts (tuple): The ring settings (1-26), right most rotor first.
+    - positions (tuple): The rotor positions (0-25) at the start of the message, right most rotor first.
+    """
+
+    score: float
+    rotor_numbers: tuple
+    rotor_shifts: tuple
+    positions: tuple
+
+
+def all_ring_settings() -> tuple:
+    """
+    Returns the ring settings worth searching: all the 26 * 26 settings of the right and middle rotors.
+    The left rotor never turns another rotor, so its ring setting is left at 1. See : ciphertext_only_attack._climb_ring_settings()
+    """
+    return tuple((right, middle, 1) for right, middle in product(range(1, 27), repeat=2))
+
+
+def work_units(rotor_orders: tuple, ring_settings: tuple) -> list[WorkUnit]:
+    """
+    Splits the keyspace into work units, in a fixed order. The index of a work unit in this list is its id in the checkpoint.
+
+    Args:
+    - rotor_orders (tuple): The rotor orders, right most rotor first.
+    - ring_settings (tuple): The ring settings, right most rotor first.
+
+    Returns:
+    - list[WorkUnit]: Every rotor order with every ring setting.
+    """
+    return [
+        WorkUnit(tuple(rotor_numbers), tuple(rotor_shifts))
+        for rotor_numbers, rotor_shifts in product(rotor_orders, ring_settings)
+    ]
+
+
+def search_keys(
+    ciphertext: str,
+    rotor_orders: tuple = ALL_ROTOR_ORDERS,
+    ring_settings: tuple = ((1, 1, 1),),
+    plugboard_settings: list[int, int] = (),
+    scorer: Callable[[list[int]], float] = index_of_coincidence,
+    results_count: int = 10,
+    processes: int = None,
+    checkpoint_path: str = None,
+    checkpoint_every: int = 10,
+) -> list[SearchResult]:
+    """
+    Searches every rotor order, ring setting and start position for the keys that decrypt the ciphertext best.
+
+    Args:
+    - ciphertext (str): The enciphered message. Only its letters are used.
+    - rotor_orders (tuple): The rotor orders to search, right most rotor first. All 60 by default.
+    - ring_settings (tuple): The ring settings to search, right most rotor first. See : all_ring_settings()
+    - plugboard_settings (list[int, int]): The plugboard settings to decrypt with, if they are known.
+    - scorer (Callable): Scores a decryption (a list of letter number values). Higher is better.
+    It must be picklable to be sent to the other processes, like a function of a module or an ngram_scorer.NgramScorer.
+    - results_count (int): How many of the best keys to keep.
+    - processes (int): How many processes to search with. 1 searches in this process. None uses all the CPU cores.
+    - checkpoint_path (str): The JSON file to save the progress to, and to resume from if it exists. No checkpoint if None.
+    - checkpoint_every (int): How many work units are done between two checkpoints.
+
+    Returns:
+    - list[SearchResult]: The best keys, the best first.
+    """
+    ciphertext = "".join(char for char in ciphertext.upper() if "A" <= char <= "Z")
+    units = work_units(rotor_orders, ring_settings)
+
+    done_units = set()
+    best = []
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        done_units, best = load_checkpoint(checkpoint_path, ciphertext, units)
+
+    pending_units = [index for index in range(len(units)) if index not in done_units]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    def unit_done(unit_index: int, unit_results: list) -> None:
+        # The best keys of every work unit go into the heap of the whole search
+        for result in unit_results:
+            _push_result(best, tuple(result), results_count)
+        done_units.add(unit_index)
+
+        if checkpoint_path is not None and len(done_units) % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, ciphertext, units, done_units, best)
+
+    if processes == 1:
+        for unit_index in pending_units:
+            unit_done(
+                unit_index,
+                search_work_unit(ciphertext, units[unit_index], plugboard_settings, scorer, results_count),
+            )
+    elif pending_units:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = {
+                executor.submit(
+                    search_work_unit,
+                    ciphertext,
+                    units[unit_index],
+                    plugboard_settings,
+                    scorer,
+                    results_count,
+                ): unit_index
+                for unit_index in pending_units
+            }
+            # The work units are collected as soon as they are done, whatever order they were sent in
+            for future in as_completed(futures):
+                unit_done(futures[future], future.result())
+
+    if checkpoint_path is not None:
+        save_checkpoint(checkpoint_path, ciphertext, units, done_units, best)
+
+    return [SearchResult(*result) for result in sorted(best, reverse=True)]
+
+
+def search_work_unit(
+    ciphertext: str,
+    unit: WorkUnit,
+    plugboard_settings: list[int, int],
+    scorer: Callable[[list[int]], float],
+    results_count: int,
+) -> list[tuple]:
+    """
+    Tries every start position of one work unit. It is a top level function, so that it can run in a process pool.
+
+    Args:
+    - ciphertext (str): The ciphertext letters, A-Z only.
+    - unit (WorkUnit): The rotor order and ring settings to search.
+    - plugboard_settings (list[int, int]): The plugboard settings.
+    - scorer (Callable): Scores a decryption (a list of letter number values).
+    - results_count (int): How many of the best keys to send back.
+
+    Returns:
+    - list[tuple]: The best (score, rotor numbers, rotor shifts, positions) of the work unit.
+    """
+    rotors = [Rotor(number, shift, 0) for number, shift in zip(unit.rotor_numbers, unit.rotor_shifts)]
+
+    if numpy_engine.is_available():
+        scores = _all_positions_scores(ciphertext, rotors, plugboard_settings, scorer)
+    else:
+        letters = [ord(char) - ord("A") for char in ciphertext]
+        scores = all_positions_scores_without_numpy(letters, rotors, plugboard_settings, scorer)
+
+    best = []
+    for state, score in enumerate(scores):
+        _push_result(
+            best,
+            (float(score), unit.rotor_numbers, unit.rotor_shifts, (state % 26, state // 26 % 26, state // 676)),
+            results_count,
+        )
+
+    return best
+
+
+def save_checkpoint(checkpoint_path: str, ciphertext: str, units: list, done_units: set, best: list) -> None:
+    """
+    Saves the progress of the search to a JSON file.
+    The file is written next to the old one and then renamed over it, so a search stopped while saving never leaves a broken checkpoint.
+
+    Args:
+    - checkpoint_path (str): The path of the checkpoint file.
+    - ciphertext (str): The ciphertext letters.
+    - units (list): All the work units of the search.
+    - done_units (set): The indexes of the work units that are done.
+    - best (list): The heap of the best keys so far.
+    """
+    checkpoint = {
+        "ciphertext": ciphertext,
+        "units": [[list(unit.rotor_numbers), list(unit.rotor_shifts)] for unit in units],
+        "done_units": sorted(done_units),
+        "best": [[score, list(numbers), list(shifts), list(positions)] for score, numbers, shifts, positions in best],
+    }
+
+    temporary_path = checkpoint_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(temporary_path, checkpoint_path)
+
+
+def load_checkpoint(checkpoint_path: str, ciphertext: str, units: list) -> tuple:
+    """
+    Loads the progress of a search from a JSON file.
+
+    Args:
+    - checkpoint_path (str): The path of the checkpoint file.
+    - ciphertext (str): The ciphertext letters of the search being resumed.
+    - units (list): All the work units of the search being resumed.
+
+    Returns:
+    - tuple: The indexes of the work units that are done (set), and the heap of the best keys so far (list).
+    """
+    with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+
+    # A checkpoint of another search can not be resumed
+    saved_units = [WorkUnit(tuple(numbers), tuple(shifts)) for numbers, shifts in checkpoint["units"]]
+    if checkpoint["ciphertext"] != ciphertext or saved_units != units:
+        print(f"CheckpointError. {checkpoint_path} is the checkpoint of another search!")
+        sys.exit(1)
+
+    best = [
+        (score, tuple(numbers), tuple(shifts), tuple(positions))
+        for score, numbers, shifts, positions in checkpoint["best"]
+    ]
+    heapq.heapify(best)
+
+    return set(checkpoint["done_units"]), best
+
+
+def _push_result(best: list, result: tuple, results_count: int) -> None:
+    """
+    Pushes a result into a heap that keeps only the results_count best ones. The worst kept result is always best[0].
+    """
+    if len(best) < results_count:
+        heapq.heappush(best, result)
+    elif result > best[0]:
+        heapq.heapreplace(best, result)
+
+
+def _all_positions_scores(
+    ciphertext: str, rotors: list[Rotor], plugboard_settings: list[int, int], scorer: Callable
+) -> list[float]:
+    """
+    Returns the score of the decryption from every start position, using NumPy.
+    Index position_1 + 26 * position_2 + 676 * position_3, like numpy_engine.encipher_all_positions().
+    """
+    decryptions = numpy_engine.encipher_all_positions(ciphertext, *rotors, plugboard_settings) - ord("A")
+
+    # An n-gram scorer scores all the rows at once, and so does the default index of coincidence
+    if hasattr(scorer, "score_array"):
+        return scorer.score_array(decryptions)
+    if scorer is index_of_coincidence:
+        return index_of_coincidence_array(decryptions)
+
+    return [scorer(decryption) for decryption in decryptions.tolist()]
@@ -0,0 +1,239 @@
+"""
+This file contains an n-gram scorer, that tells how much a text looks like a real language.
+It is used to score candidate decryptions in key searches (See : ciphertext_only_attack.py).
+
+The log-probability of every n-gram (1 to 4 letters) is kept in one flat array, indexed by the n-gram as a base-26 number.
+"TION" is T * 26^3 + I * 26^2 + O * 26 + N. So scoring a text is one array lookup per letter.
+
+Run this file to benchmark the scorer: python -m src.ngram_scorer
+"""
+
+import math
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+
+from src import numpy_engine
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+class NgramScorer:
+    """
+    This class scores texts by the log-probabilities of their n-grams.
+
+    Attributes:
+    - n (int): The n-gram length, 1-4. 1 for unigrams, 4 for quadgrams.
+    - log_probabilities (array): The log10 probability of every n-gram, indexed by the n-gram as a base-26 number.
+    n-grams that never appeared get a floor value, a bit lower than the rarest n-gram that did appear.
+
+    Methods:
+    - from_file(path: str) -> NgramScorer:
+        Loads the n-gram counts from a file with one "NGRAM COUNT" pair per line.
+
+    - from_text(text: str, n: int) -> NgramScorer:
+        Counts the n-grams of a training text.
+
+    - score(letters: list[int]) -> float:
+        Scores a list of letter number values, in pure Python.
+
+    - score_array(letters: np.ndarray) -> float | np.ndarray:
+        Scores a uint8 array of letter number values with NumPy. A 2D array is scored row by row.
+
+    - score_text(text: str) -> float:
+        Scores a text, for example the output of ciphering_algorithm.encipher(). Only its letters are scored.
+    """
+
+    def __init__(self, counts: dict[str, int]):
+        # All the n-grams must have the same length
+        lengths = {len(ngram) for ngram in counts}
+        if len(lengths) != 1 or not 1 <= next(iter(lengths)) <= 4:
+            print("NgramLengthError. All the n-grams must have the same length, between 1 and 4 letters!")
+            sys.exit(1)
+
+        self._n = lengths.pop()
+
+        total = sum(counts.values())
+        floor = math.log10(0.01 / total)
+
+        # One entry for every possible n-gram. The ones that never appeared keep the floor value.
+        self._log_probabilities = array("d", [floor]) * 26**self._n
+        for ngram, count in counts.items():
+            self._log_probabilities[self.ngram_index(ngram)] = math.log10(count / total)
+
+        # The same table for NumPy, if it is installed
+        if numpy_engine.is_available():
+            self._log_probabilities_array = np.frombuffer(self._log_probabilities, dtype=np.float64)
+            self._place_values = 26 ** np.arange(self._n - 1, -1, -1, dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return f"NgramScorer n {self._n}"
+
+    @classmethod
+    def from_file(cls, path: str) -> "NgramScorer":
+        """
+        Loads the n-gram counts from a file with one "NGRAM COUNT" pair per line, like "TION 13168375".
+
+        Args:
+        - path (str): The path of the file.
+
+        Returns:
+        - NgramScorer: The scorer.
+        """
+        counts = {}
+        with open(path, encoding="ascii") as ngrams_file:
+            for line in ngrams_file:
+                if line.strip():
+                    ngram, count = line.split()
+                    counts[ngram.upper()] = int(count)
+
+        return cls(counts)
+
+    @classmethod
+    def from_text(cls, text: str, n: int) -> "NgramScorer":
+        """
+        Counts the n-grams of a training text, for example a book in the language of the messages.
+
+        Args:
+        - text (str): The training text. Only its letters are used.
+        - n (int): The n-gram length, 1-4.
+
+        Returns:
+        - NgramScorer: The scorer.
+        """
+        letters = "".join(char for char in text.upper() if "A" <= char <= "Z")
+
+        return cls(Counter(letters[index : index + n] for index in range(len(letters) - n + 1)))
+
+    @staticmethod
+    def ngram_index(ngram: str) -> int:
+        """
+        Returns the n-gram as a base-26 number. "AB" = 0 * 26 + 1 = 1.
+        """
+        index = 0
+        for char in ngram:
+            index = index * 26 + ord(char) - ord("A")
+        return index
+
+    @property
+    def n(self):
+        return self._n
+
+    @property
+    def log_probabilities(self):
+        return self._log_probabilities
+
+    def __call__(self, letters: list[int]) -> float:
+        # A scorer is just a function from letters to a score. See : ciphertext_only_attack.ciphertext_only_attack()
+        return self.score(letters)
+
+    def score(self, letters: list[int]) -> float:
+        """
+        Scores a list of letter number values (0-25), in pure Python.
+
+        The index of the current n-gram is rolled along the text: drop the oldest letter, shift, and add the new one.
+        So every letter costs one multiplication, one modulo and one lookup.
+
+        Args:
+        - letters (list[int]): The letters as number values.
+
+        Returns:
+        - float: The sum of the log-probabilities of all the n-grams. Higher is better.
+        """
+        n = self._n
+        log_probabilities = self._log_probabilities
+        ngrams_count = 26**n
+
+        # The index of the first n - 1 letters
+        index = 0
+        for letter in letters[: n - 1]:
+            index = index * 26 + letter
+
+        total = 0.0
+        for letter in letters[n - 1 :]:
+            index = (index * 26 + letter) % ngrams_count
+            total += log_probabilities[index]
+
+        return total
+
+    def score_array(self, letters):
+        """
+        Scores a uint8 array of letter number values (0-25) with NumPy.
+
+        Args:
+        - letters (np.ndarray): A 1D array for one text, or a 2D array with one text per row.
+
+        Returns:
+        - float | np.ndarray: The score of the text, or an array with the score of every row.
+        """
+        if not numpy_engine.is_available():
+            print("NumPyNotInstalledError. score_array() needs NumPy to be installed!")
+            sys.exit(1)
+
+        letters = np.asarray(letters, dtype=np.int64)
+        # A text shorter than n letters has no n-gram, and scores 0
+        ngrams_count = max(letters.shape[-1] - self._n + 1, 0)
+
+        # The index of every n-gram, from n shifted views of the letters
+        indexes = np.zeros(letters.shape[:-1] + (ngrams_count,), dtype=np.int64)
+        for offset, place_value in enumerate(self._place_values):
+            indexes += letters[..., offset : offset + ngrams_count] * place_value
+
+        scores = self._log_probabilities_array[indexes].sum(axis=-1)
+
+        if letters.ndim == 1:
+            return float(scores)
+        return scores
+
+    def score_text(self, text: str) -> float:
+        """
+        Scores a text, for example the output of ciphering_algorithm.encipher(). Only its letters are scored.
+
+        Args:
+        - text (str): The text to score.
+
+        Returns:
+        - float: The score of the text. Higher is better.
+        """
+        return self.score([ord(char) - ord("A") for char in text.upper() if "A" <= char <= "Z"])
+
+
+def benchmark(letters_count: int = 100_000, repeats: int = 5) -> None:
+    """
+    Prints how fast the pure Python and the NumPy scoring are, on random letters with a quadgram table.
+
+    Args:
+    - letters_count (int): How many letters to score.
+    - repeats (int): How many times to score them. The best time is printed.
+    """
+    generator = random.Random(1944)
+    training_text = "".join(chr(generator.randrange(26) + ord("A")) for _ in range(200_000))
+    scorer = NgramScorer.from_text(training_text, 4)
+    letters = [generator.randrange(26) for _ in range(letters_count)]
+
+    def best_time(function, argument) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function(argument)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    python_time = best_time(scorer.score, letters)
+    print(f"Pure Python: {letters_count / python_time / 1e6:.2f} million letters per second")
+
+    if numpy_engine.is_available():
+        letters_array = np.array(letters, dtype=np.uint8)
+        numpy_time = best_time(scorer.score_array, letters_array)
+        print(f"NumPy:       {letters_count / numpy_time / 1e6:.2f} million letters per second")
+
+        rows = letters_array[: (letters_count // 100) * 100].reshape(-1, 100)
+        rows_time = best_time(scorer.score_array, rows)
+        print(f"NumPy rows:  {len(rows) / rows_time / 1e6:.3f} million 100 letter texts per second")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,295 @@
+"""
+This file contains a NumPy version of the enciphering algorithm, for very long texts.
+Instead of enciphering one letter at a time, the whole text is turned into an array and every step
+of the Enigma machine is done on all the letters at once.
+
+NumPy is optional. Without it, encipher() falls back to the EnigmaMachine class and gives the same result.
+"""
+
+import sys
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import enigma_parts
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# How many letters encipher_all_positions() enciphers at once. Every letter in a block takes a few int64 entries
+# (the rotor positions and the state), so the start positions are done in blocks of rows instead of all 17,576 at once.
+ALL_POSITIONS_BLOCK_LETTERS = 1 << 20
+
+
+def is_available() -> bool:
+    """
+    Returns True if NumPy is installed and the vectorized engine can be used.
+    """
+    return np is not None
+
+
+def encipher(
+    text: str,
+    rotor_1: Rotor,
+    rotor_2: Rotor,
+    rotor_3: Rotor,
+    plugboard_settings: list[int, int],
+) -> str:
+    """
+    Encrypts the given text using the Enigma machine, all the letters at once.
+    Gives exactly the same result as ciphering_algorithm.encipher(), and moves the rotors the same way.
+
+    Args:
+        text (str): The text to be encrypted.
+        rotor_1 (Rotor): The first rotor in the Enigma machine.
+        rotor_2 (Rotor): The second rotor in the Enigma machine.
+        rotor_3 (Rotor): The third rotor in the Enigma machine.
+        plugboard_settings (list[int, int]): The plugboard settings.
+
+    Returns:
+        str: The encrypted text.
+    """
+    # The arrays hold one byte per char, so only ASCII text can be vectorized.
+    # Anything else goes through the EnigmaMachine, which gives the same result.
+    if np is None or not text.isascii():
+        machine = EnigmaMachine(rotor_1, rotor_2, rotor_3, plugboard_settings)
+        return machine.encipher(text)
+
+    rotors = (rotor_1, rotor_2, rotor_3)
+    plugboard = enigma_parts.create_plugboard_table(plugboard_settings)
+
+    codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    enciphered_codes, final_positions = encipher_codes(codes, rotors, plugboard)
+
+    # Move the rotors to where they are after the text, like the per letter algorithm does
+    for rotor, position in zip(rotors, final_positions):
+        if rotor.position % 26 != position:
+            rotor.position = position
+
+    return enciphered_codes.tobytes().decode("ascii")
+
+
+def encipher_codes(codes, rotors: tuple, plugboard: list) -> tuple:
+    """
+    Enciphers an array of ASCII codes. Letters are enciphered and every other char is kept as it is.
+    The Rotor objects are not moved, their final positions are returned instead.
+
+    Args:
+    - codes (np.ndarray): The text as an array of ASCII codes (uint8).
+    - rotors (tuple): The 3 rotors. rotors[0] is the right most rotor, rotors[2] is the left rotor.
+    - plugboard (tuple): The plugboard as a 26 entry table. See : enigma_parts.create_plugboard_table()
+
+    Returns:
+    - tuple: The enciphered text as an array of ASCII codes (uint8), and the 3 rotor positions after the last letter.
+    """
+    mask = letter_mask(codes)
+    plugboard = np.asarray(plugboard, dtype=np.intp)
+
+    # Convert the letters to their number values. A = 0, B = 1, etc.
+    letters = entry_table(plugboard)[codes[mask]]
+    letters_count = len(letters)
+
+    # The rotors come back to the same positions every 26 * 26 * 26 letters, so one full turn of states is all there is.
+    # Every state is composed into one permutation, and then every letter is a single lookup in the permutation of its state.
+    period = min(letters_count, 26**3)
+    positions = rotor_positions(rotors, period)
+    permutations = state_permutations(rotors, positions, plugboard)
+
+    # state_rows[i] is where the permutation of letter i starts in the flattened permutations array
+    state_rows = np.resize(np.arange(period, dtype=np.intp) * 26, letters_count)
+    letters = permutations.ravel()[state_rows + letters]
+
+    enciphered_codes = codes.copy()
+    enciphered_codes[mask] = letters + ord("A")
+
+    if letters_count:
+        last_state = (letters_count - 1) % period
+        final_positions = tuple(int(rotor_positions_array[last_state]) for rotor_positions_array in positions)
+    else:
+        final_positions = tuple(rotor.position % 26 for rotor in rotors)
+
+    return enciphered_codes, final_positions
+
+
+def encipher_all_positions(
+    text: str,
+    rotor_1: Rotor,
+    rotor_2: Rotor,
+    rotor_3: Rotor,
+    plugboard_settings: list[int, int],
+) -> "np.ndarray":
+    """
+    Encrypts the same text from every one of the 26 * 26 * 26 = 17,576 start positions at once.
+    The rotor numbers and settings are used, and the positions of the rotors are ignored (and not changed).
+
+    Args:
+        text (str): The ASCII text to be encrypted.
+        rotor_1 (Rotor): The first rotor in the Enigma machine.
+        rotor_2 (Rotor): The second rotor in the Enigma machine.
+        rotor_3 (Rotor): The third rotor in the Enigma machine.
+        plugboard_settings (list[int, int]): The plugboard settings.
+
+    Returns:
+        np.ndarray: A uint8 array of shape (17576, len(text)) with the ASCII codes of the encrypted text.
+        Row position_1 + 26 * position_2 + 676 * position_3 is the text encrypted from those start positions (0-25).
+    """
+    if np is None:
+        print("NumPyNotInstalledError. encipher_all_positions() needs NumPy to be installed!")
+        sys.exit(1)
+
+    if not text.isascii():
+        print("TextEncodingError. encipher_all_positions() can only encrypt ASCII text!")
+        sys.exit(1)
+
+    rotors = (rotor_1, rotor_2, rotor_3)
+    plugboard = np.asarray(enigma_parts.create_plugboard_table(plugboard_settings), dtype=np.intp)
+
+    codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    mask = letter_mask(codes)
+    letters = entry_table(plugboard)[codes[mask]]
+    letters_count = len(letters)
+
+    # Every start position is a message of its own. Row i starts from state i.
+    all_states = np.arange(26**3, dtype=np.int64)
+    start_positions = np.stack([all_states % 26, all_states // 26 % 26, all_states // 676], axis=1)
+
+    # Every state is used, so compose all of them once. They are stored as the ASCII codes of the enciphered letters,
+    # so the rows below are filled straight from them without another uint8 array per block.
+    permutations = state_permutations(
+        rotors, (all_states % 26, all_states // 26 % 26, all_states // 676), plugboard
+    )
+    permutations += ord("A")
+
+    enciphered_codes = np.empty((26**3, len(codes)), dtype=np.uint8)
+    enciphered_codes[:] = codes
+
+    # The rows are done in blocks, so the int64 positions and states only ever exist for one block of letters
+    block_rows = max(ALL_POSITIONS_BLOCK_LETTERS // max(letters_count, 1), 1)
+    for first_row in range(0, 26**3, block_rows):
+        rows = slice(first_row, min(first_row + block_rows, 26**3))
+        rows_count = rows.stop - rows.start
+
+        positions = message_positions(rotors, start_positions[rows], np.full(rows_count, letters_count))
+        states = (positions[0] + 26 * positions[1] + 676 * positions[2]).reshape(rows_count, letters_count)
+
+        enciphered_codes[rows, mask] = permutations[states, letters]
+
+    return enciphered_codes
+
+
+def state_permutations(rotors: tuple, positions: tuple, plugboard) -> "np.ndarray":
+    """
+    Composes the whole signal path of the machine into one permutation for each of the given rotor positions.
+
+    Args:
+    - rotors (tuple): The 3 rotors. rotors[0] is the right most rotor, rotors[2] is the left rotor.
+    - positions (tuple): 3 arrays with the positions of the rotors, like the ones returned by rotor_positions().
+    - plugboard (np.ndarray): The plugboard as a 26 entry table.
+
+    Returns:
+    - np.ndarray: An array of shape (len(positions[0]), 26). permutations[i][letter] is the enciphered letter in state i,
+    plugboard included on both sides.
+    """
+    # The offset (position - setting) of every rotor picks its table. One row per state.
+    offsets = [
+        ((rotor_positions_array - rotor.setting) % 26)[:, None]
+        for rotor, rotor_positions_array in zip(rotors, positions)
+    ]
+    forward = [np.asarray(rotor.forward_tables, dtype=np.intp) for rotor in rotors]
+    inverse = [np.asarray(rotor.inverse_tables, dtype=np.intp) for rotor in rotors]
+    reflector = np.asarray(enigma_parts.UKW_B_REFLECTOR, dtype=np.intp)
+
+    # Every letter of the alphabet in every state. Through the plugboard, the rotors, the reflector,
+    # back through the rotors and the plugboard
+    letters = np.broadcast_to(plugboard, (len(positions[0]), 26))
+    for rotor_index in range(3):
+        letters = forward[rotor_index][offsets[rotor_index], letters]
+    letters = reflector[letters]
+    for rotor_index in reversed(range(3)):
+        letters = inverse[rotor_index][offsets[rotor_index], letters]
+
+    return plugboard[letters].astype(np.uint8)
+
+
+def rotor_positions(rotors: tuple, letters_count: int) -> tuple:
+    """
+    Returns the positions of the 3 rotors for each of the next letters, without turning the rotors one step at a time.
+    Follows the same rules as Rotor.rotor_turn(): the rotors turn before every letter,
+    the middle rotor turns when the right most rotor reaches its notch,
+    and the left rotor turns when the middle rotor reaches its notch.
+    It is the array version of Rotor.advance_positions().
+
+    Args:
+    - rotors (tuple): The 3 rotors. rotors[0] is the right most rotor, rotors[2] is the left rotor.
+    - letters_count (int): How many letters to return the positions for.
+
+    Returns:
+    - tuple: 3 arrays of length letters_count. positions[rotor_index][i] is where the rotor is when letter i is enciphered.
+    """
+    start_positions = np.array([[rotor.position for rotor in rotors]], dtype=np.int64)
+
+    return message_positions(rotors, start_positions, np.array([letters_count]))
+
+
+def message_positions(rotors: tuple, start_positions, letters_counts) -> tuple:
+    """
+    Returns the positions of the 3 rotors for every letter of many messages, that all use the same rotors
+    but start from different positions. Same rules as rotor_positions().
+
+    Args:
+    - rotors (tuple): The 3 rotors. rotors[0] is the right most rotor, rotors[2] is the left rotor. Only their notches are used.
+    - start_positions (np.ndarray): An array of shape (messages, 3) with the start positions of every message.
+    - letters_counts (np.ndarray): How many letters every message has.
+
+    Returns:
+    - tuple: 3 arrays with one entry per letter, the letters of all the messages one after the other.
+    positions[rotor_index][i] is where the rotor is when letter i is enciphered.
+    """
+    letters_counts = np.asarray(letters_counts, dtype=np.int64)
+    total_letters = int(letters_counts.sum())
+
+    # The step of every letter inside its own message. 1 for the first letter of every message.
+    message_starts = np.repeat(np.cumsum(letters_counts) - letters_counts, letters_counts)
+    steps = np.arange(1, total_letters + 1, dtype=np.int64) - message_starts
+
+    positions = []
+
+    for rotor_index, rotor in enumerate(rotors):
+        start = np.repeat(np.asarray(start_positions, dtype=np.int64)[:, rotor_index] % 26, letters_counts)
+        positions.append((start + steps) % 26)
+
+        # How many times the rotor reached one of its notches, so how many steps the next rotor made
+        next_steps = 0
+        for notch in rotor.notches:
+            # How many steps until the rotor reaches the notch for the first time. A full turn if it is at the notch already.
+            first_notch = (notch - start) % 26
+            first_notch[first_notch == 0] = 26
+
+            next_steps = next_steps + (steps + 26 - first_notch) // 26
+
+        steps = next_steps
+
+    return tuple(positions)
+
+
+def entry_table(plugboard) -> "np.ndarray":
+    """
+    Returns a table that maps every ASCII code to the number value of the letter that goes into the machine.
+
+    Upper case letters map to their number value. A = 0, B = 1, etc.
+    Any other letter is wrapped around the alphabet and skips the plugboard, exactly like it does in ciphering_algorithm.enigma_machine().
+    The permutations start with the plugboard, and the plugboard is its own inverse, so those letters are swapped here to cancel it.
+    """
+    entry_table = (np.arange(256, dtype=np.intp) - ord("A")) % 26
+    entry_table[ord("a") : ord("z") + 1] = plugboard[entry_table[ord("a") : ord("z") + 1]]
+    return entry_table
+
+
+def letter_mask(codes) -> "np.ndarray":
+    """
+    Returns a boolean array that is True where the ASCII code is a letter (A-Z or a-z).
+    """
+    return ((codes >= ord("A")) & (codes <= ord("Z"))) | (
+        (codes >= ord("a")) & (codes <= ord("z"))
+    )
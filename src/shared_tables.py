@@ -0,0 +1,257 @@
+"""
+This file contains the precomputed permutation tables that many processes can share, without every process building its own.
+
+All the tables are packed into one flat block of bytes, one byte per letter:
+1. A header: MAGIC, the number of rotors and the reflector wiring.
+2. The rotor tables: for every rotor, forward and reverse, the wiring at every offset (position - setting).
+3. The core tables: for every (middle rotor, left rotor) pair, at every middle offset and left offset,
+   the middle rotor -> left rotor -> reflector -> left rotor -> middle rotor permutation. See : EnigmaMachine._core()
+
+The tables are by offset and not by position, so they do not depend on the ring settings,
+and one block serves every machine with the same reflector.
+
+The block is put in a multiprocessing.shared_memory segment by SharedTables. The worker processes attach to it by its name,
+and read the tables straight from it, without copying the whole block (See : EnigmaMachine, tables argument).
+"""
+
+import sys
+from multiprocessing import shared_memory
+
+from classes.rotor import Rotor
+from src import components, enigma_parts
+
+
+# Marks the start of a table block, so that a random file or segment is not taken for one
+MAGIC = b"ENIGMATB"
+
+# The rotors that have tables: rotors 1 to ROTORS_COUNT. See : components.ROTORS
+ROTORS_COUNT = len(components.ROTORS)
+
+# The header is MAGIC, the number of rotors and the reflector wiring, padded to 64 bytes
+HEADER_SIZE = 64
+
+
+def tables_size(rotors_count: int = ROTORS_COUNT) -> int:
+    """
+    Returns the size in bytes of a table block.
+
+    Args:
+    - rotors_count (int): The number of rotors in the block.
+
+    Returns:
+    - int: The size of the header, the rotor tables and the core tables.
+    """
+    return HEADER_SIZE + rotors_count * 2 * 26 * 26 + rotors_count * rotors_count * 26 * 26 * 26
+
+
+def rotor_table_start(rotor_number: int, is_reversed: bool, offset: int) -> int:
+    """
+    Returns where the table of a rotor at an offset starts in the block. The table is the 26 bytes from there.
+
+    Args:
+    - rotor_number (int): The rotor number, 1 to ROTORS_COUNT.
+    - is_reversed (bool): True for the table of the reverse pass (after the reflector).
+    - offset (int): The rotor offset (position - setting), 0-25.
+
+    Returns:
+    - int: The index of the first byte of the table.
+    """
+    return HEADER_SIZE + (((rotor_number - 1) * 2 + is_reversed) * 26 + offset) * 26
+
+
+def core_table_start(
+    rotors_count: int, middle_rotor_number: int, left_rotor_number: int, middle_offset: int, left_offset: int
+) -> int:
+    """
+    Returns where a core table starts in the block. The table is the 26 bytes from there.
+
+    Args:
+    - rotors_count (int): The number of rotors in the block.
+    - middle_rotor_number (int): The number of the middle rotor.
+    - left_rotor_number (int): The number of the left rotor.
+    - middle_offset (int): The offset (position - setting) of the middle rotor, 0-25.
+    - left_offset (int): The offset (position - setting) of the left rotor, 0-25.
+
+    Returns:
+    - int: The index of the first byte of the table.
+    """
+    pair_index = (middle_rotor_number - 1) * rotors_count + left_rotor_number - 1
+    return (
+        HEADER_SIZE
+        + rotors_count * 2 * 26 * 26
+        + ((pair_index * 26 + middle_offset) * 26 + left_offset) * 26
+    )
+
+
+def build_tables(reflector: tuple = enigma_parts.UKW_B_REFLECTOR) -> bytearray:
+    """
+    Builds a table block with every rotor table and every core table.
+
+    Args:
+    - reflector (tuple): The reflector wiring. UKW-B by default.
+
+    Returns:
+    - bytearray: The table block.
+    """
+    tables = bytearray(tables_size())
+    tables[: len(MAGIC)] = MAGIC
+    tables[len(MAGIC)] = ROTORS_COUNT
+    tables[len(MAGIC) + 1 : len(MAGIC) + 27] = bytes(reflector)
+
+    rotors = [Rotor(number, 1, 0) for number in range(1, ROTORS_COUNT + 1)]
+
+    for rotor in rotors:
+        for offset in range(26):
+            start = rotor_table_start(rotor.number, False, offset)
+            tables[start : start + 26] = bytes(rotor.forward_tables[offset])
+            start = rotor_table_start(rotor.number, True, offset)
+            tables[start : start + 26] = bytes(rotor.inverse_tables[offset])
+
+    for middle_rotor in rotors:
+        for left_rotor in rotors:
+            for middle_offset in range(26):
+                forward_2 = middle_rotor.forward_tables[middle_offset]
+                inverse_2 = middle_rotor.inverse_tables[middle_offset]
+
+                for left_offset in range(26):
+                    forward_3 = left_rotor.forward_tables[left_offset]
+                    inverse_3 = left_rotor.inverse_tables[left_offset]
+
+                    start = core_table_start(
+                        ROTORS_COUNT, middle_rotor.number, left_rotor.number, middle_offset, left_offset
+                    )
+                    tables[start : start + 26] = bytes(
+                        inverse_2[inverse_3[reflector[forward_3[forward_2[letter]]]]]
+                        for letter in range(26)
+                    )
+
+    return tables
+
+
+def check_tables(tables, reflector: tuple) -> int:
+    """
+    Checks that a buffer is a table block built for the given reflector.
+
+    Args:
+    - tables: The buffer to check, like bytes, a memoryview or a mmap.
+    - reflector (tuple): The reflector wiring the tables must have been built with.
+
+    Returns:
+    - int: The number of rotors in the block.
+    """
+    if len(tables) < HEADER_SIZE or bytes(tables[: len(MAGIC)]) != MAGIC:
+        print("TablesFormatError. The buffer is not a table block!")
+        sys.exit(1)
+
+    rotors_count = tables[len(MAGIC)]
+
+    if len(tables) != tables_size(rotors_count):
+        print("TablesFormatError. The table block is not complete!")
+        sys.exit(1)
+
+    if tuple(tables[len(MAGIC) + 1 : len(MAGIC) + 27]) != tuple(reflector):
+        print("TablesReflectorError. The table block was built for another reflector!")
+        sys.exit(1)
+
+    return rotors_count
+
+
+class SharedTables:
+    """
+    This class puts a table block in shared memory, so that worker processes can read it without copying it.
+
+    The process that creates the tables owns the segment, and must unlink() it when the workers are done.
+    Every process that attaches to it must close() it. Used as a context manager, the owner does both.
+
+    Attributes:
+    - name (str): The name of the shared memory segment. Send it to the workers so they can attach().
+    - tables (memoryview): The table block.
+
+    Methods:
+    - create(reflector: tuple) -> SharedTables:
+        Builds the tables into a new shared memory segment.
+
+    - attach(name: str) -> SharedTables:
+        Attaches to a segment created by another process.
+
+    - close() -> None:
+        Stops using the segment in this process.
+
+    - unlink() -> None:
+        Frees the segment. Only the owner calls it.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, is_owner: bool):
+        self._memory = memory
+        self._is_owner = is_owner
+        # The segment can be bigger than asked for (it is rounded up to a memory page), so only the block itself is exposed
+        self._tables = memory.buf[: tables_size(memory.buf[len(MAGIC)])]
+
+    def __repr__(self) -> str:
+        return f"SharedTables name {self.name}"
+
+    def __enter__(self) -> "SharedTables":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+        if self._is_owner:
+            self.unlink()
+
+    @classmethod
+    def create(cls, reflector: tuple = enigma_parts.UKW_B_REFLECTOR) -> "SharedTables":
+        """
+        Builds the tables into a new shared memory segment.
+
+        Args:
+        - reflector (tuple): The reflector wiring. UKW-B by default.
+
+        Returns:
+        - SharedTables: The tables, owned by this process.
+        """
+        tables = build_tables(reflector)
+
+        memory = shared_memory.SharedMemory(create=True, size=len(tables))
+        memory.buf[: len(tables)] = tables
+
+        return cls(memory, is_owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTables":
+        """
+        Attaches to a segment created by another process with create().
+
+        Args:
+        - name (str): The name of the segment.
+
+        Returns:
+        - SharedTables: The tables, not owned by this process.
+        """
+        if sys.version_info >= (3, 13):
+            # Only the owner tracks the segment, so a worker that exits does not free it under the others
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(name=name)
+
+        return cls(memory, is_owner=False)
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def tables(self):
+        return self._tables
+
+    def close(self) -> None:
+        """
+        Stops using the segment in this process. The tables can not be read after this.
+        """
+        self._tables.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the segment. Only the owner calls it, once every process is done with it.
+        """
+        self._memory.unlink()
@@ -0,0 +1,138 @@
+"""
+This file contains the code that enciphers text that comes in pieces, like big files or data from the network.
+Only one chunk is held in memory at a time, no matter how big the whole input is.
+The machine state is carried from one chunk to the next, so the result is the same as enciphering everything at once.
+"""
+
+import mmap
+import os
+from typing import BinaryIO, Iterable, Iterator, TextIO, Union
+
+from classes.enigma_machine import EnigmaMachine
+
+
+def encipher_chunks(
+    chunks: Iterable[Union[str, bytes]], machine: EnigmaMachine
+) -> Iterator[Union[str, bytes]]:
+    """
+    Enciphers the chunks one after the other, as they come.
+
+    Bytes chunks are treated as ASCII, so only the bytes of the letters A-Z and a-z are enciphered
+    and every other byte is kept as it is.
+
+    Args:
+    - chunks (Iterable[str | bytes]): The text in pieces, for example the lines of a file.
+    - machine (EnigmaMachine): The machine to encipher with. Its rotors keep turning from one chunk to the next.
+
+    Returns:
+    - Iterator[str | bytes]: The enciphered chunks, in the same order and of the same type.
+    """
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray)):
+            # Bytes are enciphered as they are, without decoding them to a string and back
+            yield machine.encipher_bytes(chunk)
+        else:
+            yield machine.encipher(chunk)
+
+
+def encipher_stream(
+    source: Union[TextIO, BinaryIO],
+    destination: Union[TextIO, BinaryIO],
+    machine: EnigmaMachine,
+    chunk_size: int = 64 * 1024,
+) -> int:
+    """
+    Reads the source file chunk by chunk, enciphers it and writes it to the destination file.
+
+    Text files and binary files are both supported. Binary files are treated as ASCII,
+    so only the bytes of the letters A-Z and a-z are enciphered and every other byte is written as it is.
+
+    Args:
+    - source (TextIO | BinaryIO): The file object to read from.
+    - destination (TextIO | BinaryIO): The file object to write to. Must be the same kind (text or binary) as the source.
+    - machine (EnigmaMachine): The machine to encipher with.
+    - chunk_size (int): How many chars (or bytes) to read at once.
+
+    Returns:
+    - int: How many chars (or bytes) were enciphered.
+    """
+    total_size = 0
+
+    for chunk in encipher_chunks(_read_chunks(source, chunk_size), machine):
+        destination.write(chunk)
+        total_size += len(chunk)
+
+    return total_size
+
+
+def encipher_file(input_path: str, output_path: str, machine: EnigmaMachine) -> int:
+    """
+    Enciphers a file into a new file of the same size, using memory-mapped files.
+
+    Both files are mapped into memory, and the letters are enciphered from the input map straight into the output map.
+    The operating system pages the files in and out as needed, so even files bigger than the memory can be enciphered.
+    The file is treated as ASCII. Only the letters A-Z and a-z are enciphered, every other byte is copied as it is.
+    The letters are upper cased first, like enigma.py does with the text it is given, so enciphering the output again deciphers it.
+
+    If the output path is the input file itself, the file is enciphered in place through a single writable map.
+
+    Args:
+    - input_path (str): The path of the file to encipher.
+    - output_path (str): The path of the file to write the result to. It is created, or overwritten if it exists.
+    - machine (EnigmaMachine): The machine to encipher with.
+
+    Returns:
+    - int: The size of the file in bytes.
+    """
+    file_size = os.path.getsize(input_path)
+
+    # An empty file can not be memory-mapped, and there is nothing to encipher anyway
+    if file_size == 0:
+        if not (os.path.exists(output_path) and os.path.samefile(input_path, output_path)):
+            open(output_path, "wb").close()
+        return 0
+
+    # Opening the output for writing would empty the input before it is read, so the same file is enciphered in place
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        with open(input_path, "r+b") as input_file, mmap.mmap(
+            input_file.fileno(), file_size, access=mmap.ACCESS_WRITE
+        ) as target:
+            _upper_case_into(target, target)
+            machine.encipher_into(target, target)
+            target.flush()
+
+        return file_size
+
+    with open(input_path, "rb") as input_file, open(output_path, "w+b") as output_file:
+        # The output file must already have its final size before it can be memory-mapped
+        output_file.truncate(file_size)
+
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as source, mmap.mmap(
+            output_file.fileno(), file_size, access=mmap.ACCESS_WRITE
+        ) as target:
+            _upper_case_into(source, target)
+            machine.encipher_into(target, target)
+            target.flush()
+
+    return file_size
+
+
+def _upper_case_into(source, target, block_size: int = 1 << 20) -> None:
+    """
+    Copies an ASCII buffer into a writable buffer of the same size, with the letters a-z upper cased.
+    bytes.upper() only changes the ASCII letters and runs in C. The target can be the source itself.
+    """
+    for start in range(0, len(source), block_size):
+        end = min(start + block_size, len(source))
+        target[start:end] = source[start:end].upper()
+
+
+def _read_chunks(source: Union[TextIO, BinaryIO], chunk_size: int) -> Iterator:
+    """
+    Yields the file content chunk by chunk until the end of the file.
+    """
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
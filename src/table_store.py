@@ -0,0 +1,70 @@
+"""
+This file contains the on-disk table store: the table block of shared_tables.py, saved to a file once
+and then memory-mapped by every run that needs it, on this host or any other.
+
+A memory-mapped file is only read from the disk when a table is used, so a job that only touches a few rotor orders
+only pages in their tables, and nothing is composed at startup.
+
+Run this file to write the table store: python -m src.table_store <output file>
+"""
+
+import mmap
+import os
+import sys
+
+from src import enigma_parts, shared_tables
+
+
+def write_table_store(path: str, reflector: tuple = enigma_parts.UKW_B_REFLECTOR) -> int:
+    """
+    Builds the table block and writes it to a file.
+    The file is written next to the final path and then renamed, so a run that reads it never sees half a file.
+
+    Args:
+    - path (str): The path of the file. It is created, or overwritten if it exists.
+    - reflector (tuple): The reflector wiring. UKW-B by default.
+
+    Returns:
+    - int: The size of the file in bytes.
+    """
+    tables = shared_tables.build_tables(reflector)
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as store_file:
+        store_file.write(tables)
+    os.replace(temporary_path, path)
+
+    return len(tables)
+
+
+def open_table_store(path: str, reflector: tuple = enigma_parts.UKW_B_REFLECTOR) -> mmap.mmap:
+    """
+    Memory-maps a table store, read only. Pass it as the tables of an EnigmaMachine, and close() it when done.
+
+    Args:
+    - path (str): The path of the file.
+    - reflector (tuple): The reflector wiring the machines use. The store must have been built with it.
+
+    Returns:
+    - mmap.mmap: The table block.
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        print(f"TableStoreError. {path} is not a table store!")
+        sys.exit(1)
+
+    with open(path, "rb") as store_file:
+        # The map stays valid after the file is closed
+        tables = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    shared_tables.check_tables(tables, reflector)
+
+    return tables
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.table_store <output file>")
+        sys.exit(1)
+
+    size = write_table_store(sys.argv[1])
+    print(f"Wrote {size} bytes of tables to {sys.argv[1]}")
@@ -0,0 +1,42 @@
+"""
+Here is a test to see if enciphering many messages in one batch gives the same result as enciphering them one by one.
+"""
+
+import random
+
+from classes.rotor import Rotor
+from src import batch, ciphering_algorithm
+
+
+def test_encipher_batch_matches_encipher():
+    generator = random.Random(1942)
+
+    # A few daily keys, and many messages with their own start positions under every key
+    daily_keys = []
+    for _ in range(4):
+        rotor_numbers = generator.sample(range(1, 6), 3)
+        shifts = [generator.randint(1, 26) for _ in range(3)]
+        letters = generator.sample(range(26), 12)
+        plugboard_settings = [letters[i : i + 2] for i in range(0, 12, 2)]
+        daily_keys.append((rotor_numbers, shifts, plugboard_settings))
+
+    jobs = []
+    for message_number in range(300):
+        rotor_numbers, shifts, plugboard_settings = generator.choice(daily_keys)
+        rotor_settings = [
+            [number, shift, generator.randint(1, 26)]
+            for number, shift in zip(rotor_numbers, shifts)
+        ]
+        text = f"MESSAGE {message_number}: " + "".join(
+            generator.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ ") for _ in range(generator.randint(0, 200))
+        )
+        jobs.append(((rotor_settings, plugboard_settings), text))
+
+    expected = [
+        ciphering_algorithm.encipher(
+            text, *[Rotor(*setting) for setting in rotor_settings], plugboard_settings
+        )
+        for (rotor_settings, plugboard_settings), text in jobs
+    ]
+
+    assert batch.encipher_batch(jobs) == expected
@@ -0,0 +1,58 @@
+"""
+Here is a test to see if the bombe finds the settings that a message was really enciphered with.
+"""
+
+from classes.rotor import Rotor
+from src import bombe, ciphering_algorithm
+
+
+def test_bombe_finds_the_real_settings():
+    plaintext = "WETTERVORHERSAGEBISKAYAKEINEBESONDERENEREIGNISSE"
+    plugboard_settings = [[0, 16], [5, 7], [22, 1], [19, 23], [15, 18]]
+    rotor_numbers = (3, 1, 2)
+    positions = (17, 5, 22)
+
+    ciphertext = ciphering_algorithm.encipher(
+        plaintext,
+        *[Rotor(number, 1, position) for number, position in zip(rotor_numbers, positions)],
+        plugboard_settings,
+    )
+
+    # The first 24 letters are known
+    stops = bombe.run_bombe(ciphertext, plaintext[:24], rotor_orders=(rotor_numbers,))
+
+    real_stops = [stop for stop in stops if stop.positions == positions]
+    assert len(real_stops) == 1
+
+    # Every plugboard pair the bombe found is a real pair, or a letter that is not plugged at all
+    real_partners = {letter: letter for letter in range(26)}
+    for first, second in plugboard_settings:
+        real_partners[first], real_partners[second] = second, first
+    for first, second in real_stops[0].plugboard_pairs:
+        assert real_partners[first] == second
+
+    # Most of the start positions are ruled out
+    assert len(stops) < 100
+
+
+def test_bombe_rejects_a_crib_that_enciphers_a_letter_into_itself():
+    assert bombe.run_bombe("ABCDEF", "XBX") == []
+
+
+def test_bombe_finds_the_settings_of_double_notch_rotors():
+    # Rotor VI turns the middle rotor twice per turn, so the rotor states are on more than one cycle.
+    # (0, 1, 0) is not on the cycle that starts from (0, 0, 0).
+    plaintext = "WETTERVORHERSAGEBISKAYAKEINEBESONDERENEREIGNISSE"
+    plugboard_settings = [[0, 16], [5, 7], [22, 1]]
+    rotor_numbers = (6, 1, 2)
+    positions = (0, 1, 0)
+
+    ciphertext = ciphering_algorithm.encipher(
+        plaintext,
+        *[Rotor(number, 1, position) for number, position in zip(rotor_numbers, positions)],
+        plugboard_settings,
+    )
+
+    stops = bombe.run_bombe(ciphertext, plaintext[:24], rotor_orders=(rotor_numbers,))
+
+    assert [stop for stop in stops if stop.positions == positions]
@@ -0,0 +1,59 @@
+"""
+Here are some tests to see if the ciphertext-only attack scores the decryptions right and finds the key of a long enough message.
+"""
+
+import random
+
+import pytest
+
+from classes.rotor import Rotor
+from src import ciphering_algorithm, ciphertext_only_attack, numpy_engine
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+PLAINTEXT = (
+    "The Enigma machine is a cipher device developed and used in the early to mid twentieth century "
+    "to protect commercial diplomatic and military communication. It was employed extensively by Nazi Germany "
+    "during World War Two in all branches of the German military. The Enigma machine was considered so secure "
+    "that it was used to encipher the most top secret messages. The Enigma has an electromechanical rotor mechanism "
+    "that scrambles the twenty six letters of the alphabet. In typical use one person enters text on the keyboard "
+    "and another person writes down which of the twenty six lights above the keyboard illuminated at each key press. "
+    "If plain text is entered the illuminated letters are the ciphertext. Entering ciphertext transforms it back "
+    "into readable plaintext. The rotor mechanism changes the electrical connections between the keys and the lights "
+    "with each keypress."
+)
+
+
+def test_index_of_coincidence():
+    assert ciphertext_only_attack.index_of_coincidence([0, 0, 1, 1]) == 4 / 12
+    assert ciphertext_only_attack.index_of_coincidence(list(range(26))) == 0.0
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_index_of_coincidence_array_matches_every_row():
+    generator = random.Random(5)
+    for letters_count in (0, 1, 2, 40):
+        rows = [[generator.randrange(6) for _ in range(letters_count)] for _ in range(30)]
+
+        scores = ciphertext_only_attack.index_of_coincidence_array(np.array(rows, dtype=np.uint8).reshape(30, letters_count))
+
+        assert list(scores) == pytest.approx([ciphertext_only_attack.index_of_coincidence(row) for row in rows])
+
+
+def test_ciphertext_only_attack_finds_the_key():
+    plaintext = "".join(char for char in PLAINTEXT.upper() if char.isalpha())
+    plugboard_settings = [[0, 16], [5, 7], [22, 1]]
+
+    ciphertext = ciphering_algorithm.encipher(
+        plaintext, Rotor(3, 1, 17), Rotor(1, 1, 5), Rotor(2, 1, 22), plugboard_settings
+    )
+
+    results = ciphertext_only_attack.ciphertext_only_attack(
+        ciphertext, rotor_orders=((3, 1, 2),), candidates_count=3
+    )
+
+    best = results[0]
+    assert best.positions == (17, 5, 22)
+    assert best.plaintext == plaintext
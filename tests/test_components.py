@@ -0,0 +1,30 @@
+"""
+Here are some tests to see if the component registry has consistent rotor tables and valid reflectors.
+"""
+
+from src import components, enigma_parts
+
+
+def test_rotor_tables_are_consistent():
+    for component in list(components.ROTORS.values()) + list(components.GREEK_ROTORS.values()):
+        for letter in range(26):
+            assert component.inverse_wiring[component.wiring[letter]] == letter
+
+        for offset in (0, 7, 25):
+            for letter in range(26):
+                assert component.inverse_tables[offset][component.forward_tables[offset][letter]] == letter
+
+
+def test_reflectors_are_involutions_without_fixed_letters():
+    for reflector in components.REFLECTORS.values():
+        for letter in range(26):
+            assert reflector[letter] != letter
+            assert reflector[reflector[letter]] == letter
+
+
+def test_registry_keeps_the_enigma_I_components():
+    assert components.ROTORS[1].wiring[:4] == (4, 10, 12, 5)
+    assert tuple(component.notches for component in components.ROTORS.values()) == (
+        (18,), (6,), (23,), (11,), (0,), (1, 14), (1, 14), (1, 14)
+    )
+    assert enigma_parts.UKW_B_REFLECTOR == components.REFLECTORS["UKW-B"]
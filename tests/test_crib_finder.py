@@ -0,0 +1,52 @@
+"""
+Here are some tests to see if the crib finder gives the same offsets as checking every offset one letter at a time.
+"""
+
+import random
+
+import pytest
+
+from src import crib_finder, numpy_engine
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+def feasible_offsets(ciphertext: list[int], crib: list[int]) -> list[int]:
+    return [
+        offset
+        for offset in range(len(ciphertext) - len(crib) + 1)
+        if all(cipher != plain for cipher, plain in zip(ciphertext[offset:], crib))
+    ]
+
+
+def random_letters(generator: random.Random, count: int) -> list[int]:
+    return [generator.randrange(26) for _ in range(count)]
+
+
+def test_find_crib_positions():
+    positions = crib_finder.find_crib_positions("ABCDE FG", ["XBX", "zz", "TOO LONG FOR THE TEXT"])
+
+    assert positions == {"XBX": [1, 2, 3, 4], "zz": [0, 1, 2, 3, 4, 5], "TOO LONG FOR THE TEXT": []}
+
+
+def test_feasible_offsets_with_bitsets():
+    generator = random.Random(1940)
+    ciphertext = random_letters(generator, 2000)
+    letter_bitsets = crib_finder._letter_bitsets(bytes(letter + ord("A") for letter in ciphertext))
+
+    for crib_length in (1, 5, 24):
+        crib = random_letters(generator, crib_length)
+        assert crib_finder._feasible_offsets_with_bitsets(letter_bitsets, crib) == feasible_offsets(ciphertext, crib)
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_feasible_offsets_with_numpy():
+    generator = random.Random(1941)
+    ciphertext = random_letters(generator, 2000)
+
+    for crib_length in (1, 5, 24):
+        crib = random_letters(generator, crib_length)
+        assert crib_finder._feasible_offsets_with_numpy(
+            np.array(ciphertext, dtype=np.uint8), crib
+        ) == feasible_offsets(ciphertext, crib)
@@ -8,7 +8,7 @@ To do so we need to do the following steps:
 The deciphered word should be the same as the original word.
 """
 
-from src.ciphering_algorithm import encipher
+from src.ciphering_algorithm import encipher, encipher_bytes
 from classes.rotor import Rotor
 
 
@@ -99,3 +99,65 @@ class Enigma_machine:
     @property
     def rotor_5(self):
         return self._rotor_5
+
+
+def test_encipher_in_parallel():
+    text = "Parallel processes, ONE RESULT. " * 2000
+
+    encrypting_enigma = Enigma_machine()
+    expected = encipher(
+        text,
+        encrypting_enigma.rotor_3,
+        encrypting_enigma.rotor_2,
+        encrypting_enigma.rotor_1,
+        encrypting_enigma.plugboard,
+    )
+
+    parallel_enigma = Enigma_machine()
+    enciphered_text = encipher(
+        text,
+        parallel_enigma.rotor_3,
+        parallel_enigma.rotor_2,
+        parallel_enigma.rotor_1,
+        parallel_enigma.plugboard,
+        processes=2,
+        chunk_size=5000,
+    )
+
+    assert enciphered_text == expected
+
+    # The rotors are left where they would be after encrypting the text in one go
+    assert [
+        parallel_enigma.rotor_3.position,
+        parallel_enigma.rotor_2.position,
+        parallel_enigma.rotor_1.position,
+    ] == [
+        encrypting_enigma.rotor_3.position,
+        encrypting_enigma.rotor_2.position,
+        encrypting_enigma.rotor_1.position,
+    ]
+
+
+def test_encipher_bytes():
+    text = "Bytes from disk and sockets, NOT STRINGS! " * 100
+
+    encrypting_enigma = Enigma_machine()
+    expected = encipher(
+        text,
+        encrypting_enigma.rotor_3,
+        encrypting_enigma.rotor_2,
+        encrypting_enigma.rotor_1,
+        encrypting_enigma.plugboard,
+    )
+
+    bytes_enigma = Enigma_machine()
+    enciphered_data = encipher_bytes(
+        text.encode("ascii") + bytes([128, 233]),
+        bytes_enigma.rotor_3,
+        bytes_enigma.rotor_2,
+        bytes_enigma.rotor_1,
+        bytes_enigma.plugboard,
+    )
+
+    # Bytes that are not ASCII are kept as they are
+    assert enciphered_data == expected.encode("ascii") + bytes([128, 233])
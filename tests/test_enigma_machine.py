@@ -0,0 +1,317 @@
+"""
+Here are tests to see if the EnigmaMachine class enciphers exactly like the original per letter algorithm.
+The original algorithm is ciphering_algorithm.enigma_machine(), that enciphers one letter at a time.
+"""
+
+import random
+
+import pytest
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import ciphering_algorithm, components, enigma_parts, numpy_engine, shared_tables
+
+
+PLUGBOARD_SETTINGS = [
+    [6, 10],
+    [3, 11],
+    [8, 24],
+    [0, 16],
+    [5, 7],
+    [22, 1],
+    [19, 23],
+    [15, 18],
+    [14, 12],
+    [25, 20],
+]
+
+
+def encipher_letter_by_letter(text, rotor_1, rotor_2, rotor_3, plugboard_settings):
+    # The way ciphering_algorithm.encipher() used to work before the EnigmaMachine class
+    plugboard, reversed_plugboard = enigma_parts.create_the_plugboard(
+        plugboard_settings
+    )
+    enciphered_text = ""
+    for char in text:
+        if char.isalpha():
+            letter = ciphering_algorithm.enigma_machine(
+                ord(char) - ord("A"),
+                rotor_1,
+                rotor_2,
+                rotor_3,
+                plugboard,
+                reversed_plugboard,
+            )
+            enciphered_text += chr(letter + ord("A"))
+        else:
+            enciphered_text += char
+    return enciphered_text
+
+
+def random_rotors(generator, rotor_numbers=range(1, 6)):
+    rotor_numbers = generator.sample(rotor_numbers, 3)
+    return [
+        Rotor(number, generator.randint(1, 26), generator.randint(1, 26))
+        for number in rotor_numbers
+    ]
+
+
+def test_machine_matches_letter_by_letter_algorithm():
+    generator = random.Random(1944)
+    text = "THE QUICK BROWN FOX, jumps over the lazy dog! " * 40
+
+    for _ in range(20):
+        settings = [
+            (rotor.number, rotor.setting, rotor.position)
+            for rotor in random_rotors(generator)
+        ]
+        expected = encipher_letter_by_letter(
+            text, *[Rotor(*setting) for setting in settings], PLUGBOARD_SETTINGS
+        )
+
+        machine = EnigmaMachine(*[Rotor(*setting) for setting in settings], PLUGBOARD_SETTINGS)
+
+        assert machine.encipher(text) == expected
+
+
+def test_machine_keeps_its_state_between_calls():
+    rotors = [Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5)]
+    text = "ENIGMAMACHINE" * 100
+
+    expected = EnigmaMachine(*rotors, PLUGBOARD_SETTINGS).encipher(text)
+
+    machine = EnigmaMachine(Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS)
+    enciphered_text = machine.encipher(text[:500]) + machine.encipher(text[500:])
+
+    assert enciphered_text == expected
+
+    # The Rotor objects are left in the same positions as the machine
+    assert tuple(rotor.position for rotor in machine.rotors) == machine.positions
+    assert tuple(rotor.position % 26 for rotor in rotors) == machine.positions
+
+
+def test_cached_machine_matches_uncached_machine():
+    text = "Long messages under the same daily key, REPEATED TRAFFIC! " * 800
+
+    expected = EnigmaMachine(
+        Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS
+    ).encipher(text)
+
+    # A cache big enough for every state, and a small one that keeps dropping states
+    for cache_size in (26**3, 100):
+        machine = EnigmaMachine(
+            Rotor(3, 12, 1),
+            Rotor(2, 4, 7),
+            Rotor(1, 1, 5),
+            PLUGBOARD_SETTINGS,
+            cache_size=cache_size,
+        )
+        assert machine.encipher(text) == expected
+
+        # The same message again from the same start positions reuses the cache
+        machine.set_positions(1, 7, 5)
+        assert machine.encipher(text) == expected
+
+
+def test_seek_enciphers_the_tail_of_a_message():
+    text = "ATTACKATDAWN" * 3000
+
+    expected = EnigmaMachine(
+        Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS
+    ).encipher(text)
+
+    machine = EnigmaMachine(Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS)
+
+    for offset in (0, 1, 25, 677, 17575, 17577, 30000):
+        machine.seek(offset)
+        assert machine.encipher(text[offset:]) == expected[offset:]
+
+
+def test_machines_with_other_ring_settings_share_cores():
+    machine = EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [])
+    # Same offsets (position - setting) for every rotor, so the same wiring, but the notches fire at other letters
+    shifted_machine = EnigmaMachine(Rotor(1, 4, 3), Rotor(2, 10, 9), Rotor(3, 26, 25), [])
+
+    assert machine.offsets == shifted_machine.offsets
+    assert machine.permutation(0, 0, 0) == shifted_machine.permutation(3, 9, 25)
+    assert machine._cores is shifted_machine._cores
+
+
+def test_full_caches_are_shared_between_machines_with_the_same_wiring():
+    text = "Shared permutation caches " * 50
+
+    machine = EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [[0, 1]], cache_size=26**3)
+    shifted_machine = EnigmaMachine(Rotor(1, 7, 6), Rotor(2, 3, 2), Rotor(3, 1, 0), [[0, 1]], cache_size=26**3)
+    other_plugboard_machine = EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [[0, 2]], cache_size=26**3)
+
+    assert machine._cache is shifted_machine._cache
+    assert machine._cache is not other_plugboard_machine._cache
+
+    expected = ciphering_algorithm.encipher(text, Rotor(1, 7, 6), Rotor(2, 3, 2), Rotor(3, 1, 0), [[0, 1]])
+    machine.encipher(text)
+    assert shifted_machine.encipher(text) == expected
+
+
+def test_machine_matches_letter_by_letter_algorithm_with_rotors_VI_to_VIII():
+    generator = random.Random(1942)
+    text = "KRIEGSMARINEWETTERBERICHT" * 80
+
+    for _ in range(10):
+        settings = [
+            (rotor.number, rotor.setting, rotor.position)
+            for rotor in random_rotors(generator, range(1, 9))
+        ]
+        expected = encipher_letter_by_letter(
+            text, *[Rotor(*setting) for setting in settings], PLUGBOARD_SETTINGS
+        )
+
+        machine = EnigmaMachine(*[Rotor(*setting) for setting in settings], PLUGBOARD_SETTINGS)
+        assert machine.encipher(text) == expected
+
+        # seek() counts both notches of rotors VI-VIII
+        machine.seek(1000)
+        assert machine.encipher(text[1000:]) == expected[1000:]
+
+
+def test_machine_with_other_reflectors_is_its_own_inverse():
+    text = "REFLECTORS" * 50
+
+    for reflector in components.REFLECTORS.values():
+        enciphered_text = EnigmaMachine(
+            Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), PLUGBOARD_SETTINGS, reflector=reflector
+        ).encipher(text)
+        deciphered_text = EnigmaMachine(
+            Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), PLUGBOARD_SETTINGS, reflector=reflector
+        ).encipher(enciphered_text)
+
+        assert deciphered_text == text
+        assert all(letter != enciphered for letter, enciphered in zip(text, enciphered_text))
+
+
+def test_m4_with_greek_wheel_at_zero_is_the_3_rotor_machine():
+    # Beta with UKW-B thin and Gamma with UKW-C thin, both at A, are wired to be UKW-B and UKW-C
+    assert enigma_parts.create_m4_reflector(Rotor("Beta", 1, 1)) == components.REFLECTORS["UKW-B"]
+    assert (
+        enigma_parts.create_m4_reflector(Rotor("Gamma", 1, 1), components.REFLECTORS["UKW-C thin"])
+        == components.REFLECTORS["UKW-C"]
+    )
+
+
+def test_m4_machine_matches_letter_by_letter_algorithm():
+    generator = random.Random(1943)
+    text = "UBOOTE MELDEN POSITION, wetter klar! " * 30
+    plugboard, reversed_plugboard = enigma_parts.create_the_plugboard(PLUGBOARD_SETTINGS)
+
+    for greek_name, thin_reflector in (("Beta", "UKW-B thin"), ("Gamma", "UKW-C thin")):
+        for _ in range(5):
+            settings = [
+                (rotor.number, rotor.setting, rotor.position)
+                for rotor in random_rotors(generator, range(1, 9))
+            ]
+            greek_setting = (greek_name, generator.randint(1, 26), generator.randint(1, 26))
+            reflector = components.REFLECTORS[thin_reflector]
+
+            rotors = [Rotor(*setting) for setting in settings]
+            greek_rotor = Rotor(*greek_setting)
+            expected = ""
+            for char in text:
+                if char.isalpha():
+                    letter = ciphering_algorithm.enigma_machine(
+                        ord(char) - ord("A"), *rotors, plugboard, reversed_plugboard, greek_rotor, reflector
+                    )
+                    expected += chr(letter + ord("A"))
+                else:
+                    expected += char
+
+            # The Greek wheel never turns
+            assert (greek_rotor.setting, greek_rotor.position) == greek_setting[1:]
+
+            enciphered_text = ciphering_algorithm.encipher(
+                text,
+                *[Rotor(*setting) for setting in settings],
+                PLUGBOARD_SETTINGS,
+                greek_rotor=Rotor(*greek_setting),
+                reflector=reflector,
+            )
+            assert enciphered_text == expected
+
+
+def test_m4_in_parallel_matches_one_process():
+    text = "FUNKSPRUCH" * 400
+    settings = [(6, 2, 9), (1, 1, 1), (8, 25, 14)]
+
+    expected = ciphering_algorithm.encipher(
+        text, *[Rotor(*setting) for setting in settings], PLUGBOARD_SETTINGS, greek_rotor=Rotor("Gamma", 4, 17)
+    )
+    enciphered_text = ciphering_algorithm.encipher(
+        text,
+        *[Rotor(*setting) for setting in settings],
+        PLUGBOARD_SETTINGS,
+        processes=2,
+        chunk_size=1000,
+        greek_rotor=Rotor("Gamma", 4, 17),
+    )
+
+    assert enciphered_text == expected
+
+
+def test_lower_case_and_non_ascii_letters_match_letter_by_letter_algorithm():
+    # Lower case letters go through the plugboard at an index shifted by ord("a") - ord("A"),
+    # so the machine has to undo the entry plugboard exactly like the per letter algorithm does
+    text = "Attack at dawn, Wetterbericht für Biskaya. zzz qqq Éé " * 20
+    plugboard_settings = [[0, 1], [19, 23], [4, 7], [25, 16]]
+
+    expected = encipher_letter_by_letter(
+        text, Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), plugboard_settings
+    )
+
+    for cache_size in (0, 26**3):
+        machine = EnigmaMachine(
+            Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), plugboard_settings, cache_size=cache_size
+        )
+        assert machine.encipher(text) == expected
+
+    ascii_text = "Attack at dawn, zzz qqq XYZ " * 20
+    expected = encipher_letter_by_letter(
+        ascii_text, Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), plugboard_settings
+    )
+    machine = EnigmaMachine(Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), plugboard_settings)
+    assert machine.encipher_bytes(ascii_text.encode("ascii")) == expected.encode("ascii")
+
+    if numpy_engine.is_available():
+        assert numpy_engine.encipher(
+            ascii_text, Rotor(6, 3, 4), Rotor(2, 1, 1), Rotor(8, 5, 9), plugboard_settings
+        ) == expected
+
+
+def test_shared_cores_are_bounded():
+    # Every Greek wheel position composes another reflector, so an M4 search makes a new key for each
+    for position in range(1, 27):
+        for greek_name in ("Beta", "Gamma"):
+            EnigmaMachine(
+                Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [], greek_rotor=Rotor(greek_name, 1, position)
+            ).encipher("U" * 30)
+
+    assert len(EnigmaMachine._shared_cores) <= EnigmaMachine.SHARED_CORES_LIMIT
+
+    # A machine keeps its cores even if they were dropped from the shared ones
+    machine = EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [])
+    expected = machine.encipher("KEEPTHECORES")
+    EnigmaMachine._shared_cores.clear()
+    machine.set_positions(0, 0, 0)
+    assert machine.encipher("KEEPTHECORES") == expected
+
+
+def test_greek_wheels_are_only_the_fourth_rotor():
+    tables = shared_tables.build_tables()
+
+    # The Greek wheels have no notch and never turn, so they can not be one of the 3 turning rotors, with or without tables
+    for table_block in (None, tables):
+        with pytest.raises(ValueError):
+            EnigmaMachine(Rotor("Beta", 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [], tables=table_block)
+        with pytest.raises(ValueError):
+            EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor("Gamma", 1, 0), [], tables=table_block)
+
+    # And the fourth rotor can only be a Greek wheel
+    with pytest.raises(ValueError):
+        EnigmaMachine(Rotor(1, 1, 0), Rotor(2, 1, 0), Rotor(3, 1, 0), [], greek_rotor=Rotor(4, 1, 0))
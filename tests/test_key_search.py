@@ -0,0 +1,85 @@
+"""
+Here are some tests to see if the key search finds the key, on one and on many processes,
+and if it resumes from a checkpoint.
+"""
+
+import json
+
+import pytest
+
+from classes.rotor import Rotor
+from src import ciphering_algorithm, key_search, numpy_engine
+from src.ciphertext_only_attack import all_positions_scores_without_numpy, index_of_coincidence
+from tests.test_ciphertext_only_attack import PLAINTEXT
+
+
+PLUGBOARD_SETTINGS = [[0, 16], [5, 7], [22, 1]]
+
+
+def encipher_plaintext() -> str:
+    return ciphering_algorithm.encipher(
+        PLAINTEXT.upper(), Rotor(3, 2, 17), Rotor(1, 1, 5), Rotor(2, 1, 22), PLUGBOARD_SETTINGS
+    )
+
+
+def test_work_units():
+    units = key_search.work_units(((1, 2, 3), (3, 2, 1)), key_search.all_ring_settings())
+
+    assert len(units) == 2 * 26 * 26
+    assert units[0] == key_search.WorkUnit((1, 2, 3), (1, 1, 1))
+
+
+def test_search_keys_finds_the_key():
+    results = key_search.search_keys(
+        encipher_plaintext(),
+        rotor_orders=((3, 1, 2), (1, 2, 3)),
+        ring_settings=((1, 1, 1), (2, 1, 1)),
+        plugboard_settings=PLUGBOARD_SETTINGS,
+        results_count=3,
+        processes=2,
+    )
+
+    assert len(results) == 3
+    assert results[0].rotor_numbers == (3, 1, 2)
+    assert results[0].rotor_shifts == (2, 1, 1)
+    assert results[0].positions == (17, 5, 22)
+
+
+def test_search_keys_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    ciphertext = encipher_plaintext()
+    search_arguments = dict(
+        rotor_orders=((3, 1, 2),),
+        ring_settings=((1, 1, 1), (2, 1, 1)),
+        plugboard_settings=PLUGBOARD_SETTINGS,
+        results_count=3,
+        processes=1,
+    )
+    results = key_search.search_keys(ciphertext, **search_arguments)
+
+    # As if the search had been stopped after the first work unit
+    units = key_search.work_units(search_arguments["rotor_orders"], search_arguments["ring_settings"])
+    letters = "".join(char for char in ciphertext if char.isalpha())
+    first_unit_results = key_search.search_work_unit(
+        letters, units[0], PLUGBOARD_SETTINGS, key_search.index_of_coincidence, 3
+    )
+    key_search.save_checkpoint(checkpoint_path, letters, units, {0}, first_unit_results)
+
+    assert key_search.search_keys(ciphertext, checkpoint_path=checkpoint_path, **search_arguments) == results
+
+    with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+        assert json.load(checkpoint_file)["done_units"] == [0, 1]
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_pure_python_scores_match_numpy_scores():
+    ciphertext = "".join(char for char in encipher_plaintext() if char.isalpha())[:40]
+    letters = [ord(char) - ord("A") for char in ciphertext]
+
+    for rotor_numbers in ((3, 1, 2), (6, 1, 2), (6, 7, 8)):
+        rotors = [Rotor(number, 1, 0) for number in rotor_numbers]
+
+        expected = key_search._all_positions_scores(ciphertext, rotors, PLUGBOARD_SETTINGS, index_of_coincidence)
+        scores = all_positions_scores_without_numpy(letters, rotors, PLUGBOARD_SETTINGS, index_of_coincidence)
+
+        assert scores == pytest.approx(list(expected))
@@ -0,0 +1,49 @@
+"""
+Here are tests to see if enciphering the text one edit at a time gives the same result as enciphering it all at once.
+"""
+
+import random
+
+from classes.live_encipher import LiveEncipher
+from classes.rotor import Rotor
+from src import ciphering_algorithm
+
+
+PLUGBOARD_SETTINGS = [[0, 16], [5, 7], [22, 1]]
+
+
+def new_rotors():
+    return Rotor(3, 12, 1), Rotor(2, 4, 26), Rotor(1, 1, 5)
+
+
+def test_live_encipher_matches_encipher_after_every_edit():
+    generator = random.Random(1939)
+    live_encipher = LiveEncipher(*new_rotors(), PLUGBOARD_SETTINGS)
+    text = ""
+
+    for _ in range(300):
+        index = generator.randint(0, len(text))
+        edit = generator.choice(("type", "type", "type", "delete", "paste"))
+
+        if edit == "type":
+            text += generator.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ ,.")
+        elif edit == "delete":
+            text = text[:index] + text[index + 3 :]
+        else:
+            text = text[:index] + "PASTED TEXT" + text[index:]
+
+        old_enciphered_text = live_encipher.enciphered_text
+        first_changed, enciphered_tail = live_encipher.update(text)
+
+        expected = ciphering_algorithm.encipher(text, *new_rotors(), PLUGBOARD_SETTINGS)
+        assert live_encipher.enciphered_text == expected
+        assert old_enciphered_text[:first_changed] + enciphered_tail == expected
+
+
+def test_typing_at_the_end_only_enciphers_the_new_chars():
+    live_encipher = LiveEncipher(*new_rotors(), PLUGBOARD_SETTINGS)
+    live_encipher.update("HELLO WORLD")
+
+    assert live_encipher.update("HELLO WORLD AGAIN") == (11, live_encipher.enciphered_text[11:])
+    assert live_encipher.update("HELLO") == (5, "")
+    assert live_encipher.enciphered_text == ciphering_algorithm.encipher("HELLO", *new_rotors(), PLUGBOARD_SETTINGS)
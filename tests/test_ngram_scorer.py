@@ -0,0 +1,65 @@
+"""
+Here are some tests to see if the n-gram scorer gives the same scores in pure Python and with NumPy,
+and if it prefers real text over enciphered text.
+"""
+
+import math
+
+import pytest
+
+from classes.rotor import Rotor
+from src import ciphering_algorithm, numpy_engine
+from src.ngram_scorer import NgramScorer
+
+if numpy_engine.is_available():
+    import numpy as np
+
+
+TRAINING_TEXT = (
+    "The Enigma machine is a cipher device developed and used in the early to mid twentieth century "
+    "to protect commercial diplomatic and military communication. It was employed extensively by Nazi Germany "
+    "during World War Two in all branches of the German military. The Enigma machine was considered so secure "
+    "that it was used to encipher the most top secret messages."
+)
+
+
+def test_ngram_index():
+    assert NgramScorer.ngram_index("A") == 0
+    assert NgramScorer.ngram_index("AB") == 1
+    assert NgramScorer.ngram_index("TION") == 19 * 26**3 + 8 * 26**2 + 14 * 26 + 13
+
+
+def test_from_file(tmp_path):
+    ngrams_path = tmp_path / "bigrams.txt"
+    ngrams_path.write_text("TH 3\nHE 1\n")
+
+    scorer = NgramScorer.from_file(str(ngrams_path))
+
+    assert scorer.n == 2
+    assert len(scorer.log_probabilities) == 26**2
+    assert scorer.log_probabilities[NgramScorer.ngram_index("TH")] == pytest.approx(math.log10(3 / 4))
+    assert scorer.score_text("THE") == pytest.approx(math.log10(3 / 4) + math.log10(1 / 4))
+
+
+def test_plaintext_scores_higher_than_ciphertext():
+    scorer = NgramScorer.from_text(TRAINING_TEXT, 4)
+
+    plaintext = "THE MACHINE WAS USED TO ENCIPHER MESSAGES"
+    ciphertext = ciphering_algorithm.encipher(
+        plaintext, Rotor(1, 1, 1), Rotor(2, 1, 1), Rotor(3, 1, 1), []
+    )
+
+    assert scorer.score_text(plaintext) > scorer.score_text(ciphertext)
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_score_array_matches_score():
+    scorer = NgramScorer.from_text(TRAINING_TEXT, 3)
+    letters = [ord(char) - ord("A") for char in TRAINING_TEXT.upper() if "A" <= char <= "Z"]
+
+    assert scorer.score_array(np.array(letters, dtype=np.uint8)) == pytest.approx(scorer.score(letters))
+
+    rows = np.array([letters[:50], letters[50:100]], dtype=np.uint8)
+    assert scorer.score_array(rows) == pytest.approx([scorer.score(letters[:50]), scorer.score(letters[50:100])])
+
+    assert scorer.score_array(np.array([1, 2], dtype=np.uint8)) == 0.0
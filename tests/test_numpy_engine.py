@@ -0,0 +1,76 @@
+"""
+Here is a test to see if the NumPy engine gives exactly the same result as the original algorithm.
+"""
+
+import random
+
+import pytest
+
+from classes.rotor import Rotor
+from src import ciphering_algorithm, numpy_engine
+
+
+PLUGBOARD_SETTINGS = [[6, 10], [3, 11], [8, 24], [0, 16], [5, 7], [22, 1]]
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_numpy_engine_matches_encipher():
+    generator = random.Random(1939)
+    text = "Wetterbericht, KEINE BESONDEREN EREIGNISSE. 0600 Uhr! " * 700
+
+    for _ in range(20):
+        rotor_numbers = generator.sample(range(1, 6), 3)
+        settings = [
+            (number, generator.randint(1, 26), generator.randint(1, 26))
+            for number in rotor_numbers
+        ]
+
+        rotors = [Rotor(*setting) for setting in settings]
+        expected = ciphering_algorithm.encipher(text, *rotors, PLUGBOARD_SETTINGS)
+
+        numpy_rotors = [Rotor(*setting) for setting in settings]
+        assert numpy_engine.encipher(text, *numpy_rotors, PLUGBOARD_SETTINGS) == expected
+
+        # The rotors are left in the same positions
+        assert [rotor.position % 26 for rotor in numpy_rotors] == [
+            rotor.position % 26 for rotor in rotors
+        ]
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_encipher_all_positions():
+    text = "Keine besonderen Ereignisse."
+
+    all_positions = numpy_engine.encipher_all_positions(
+        text, Rotor(3, 12, 0), Rotor(2, 4, 0), Rotor(1, 1, 0), PLUGBOARD_SETTINGS
+    )
+
+    assert all_positions.shape == (26**3, len(text))
+
+    for position_1, position_2, position_3 in ((0, 0, 0), (25, 25, 25), (17, 5, 22), (22, 6, 1)):
+        expected = ciphering_algorithm.encipher(
+            text,
+            Rotor(3, 12, position_1),
+            Rotor(2, 4, position_2),
+            Rotor(1, 1, position_3),
+            PLUGBOARD_SETTINGS,
+        )
+        row = position_1 + 26 * position_2 + 676 * position_3
+
+        assert all_positions[row].tobytes().decode("ascii") == expected
+
+
+@pytest.mark.skipif(not numpy_engine.is_available(), reason="NumPy is not installed")
+def test_encipher_all_positions_in_small_blocks(monkeypatch):
+    rotors = (Rotor(6, 3, 0), Rotor(8, 19, 0), Rotor(2, 7, 0))
+
+    for text in ("Keine besonderen Ereignisse.", "1234!", ""):
+        expected = numpy_engine.encipher_all_positions(text, *rotors, PLUGBOARD_SETTINGS)
+
+        # Blocks of 1000 letters are 40 rows of 25 letters, that do not split the 17,576 rows evenly, so the last block is a shorter one
+        monkeypatch.setattr(numpy_engine, "ALL_POSITIONS_BLOCK_LETTERS", 1000)
+        all_positions = numpy_engine.encipher_all_positions(text, *rotors, PLUGBOARD_SETTINGS)
+        monkeypatch.undo()
+
+        assert (all_positions == expected).all()
+        assert all_positions.shape == (26**3, len(text))
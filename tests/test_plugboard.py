@@ -1,3 +1,5 @@
+import pytest
+
 from src import enigma_parts
 
 
@@ -106,3 +108,33 @@ def test_create_the_plugboard():
     # Check that the letters are swapped correctly
     assert plugboard[5] == 7
     assert reversed_plugboard[7] == 5
+
+
+def test_create_plugboard_table():
+    plugboard_settings = [[6, 10], [3, 11], [8, 24], [0, 16], [5, 7], [22, 1], [19, 23], [15, 18], [14, 12], [25, 20]]
+
+    table = enigma_parts.create_plugboard_table(plugboard_settings)
+    plugboard, reversed_plugboard = enigma_parts.create_the_plugboard(plugboard_settings)
+
+    # Same letters as the dictionaries, and going through the table twice gives the letter back
+    for letter in range(26):
+        assert table[letter] == enigma_parts.pass_through_plugboard(letter, plugboard, reversed_plugboard)
+        assert table[table[letter]] == letter
+
+    assert enigma_parts.create_plugboard_table([]) == tuple(range(26))
+
+
+def test_plugboard_table_skips_the_empty_gui_cells():
+    # The GUI turns every empty plugboard cell into ord(" ") - ord("A")
+    empty_cell = ord(" ") - ord("A")
+
+    table = enigma_parts.create_plugboard_table([[0, 1], [empty_cell, empty_cell]])
+
+    assert table == enigma_parts.create_plugboard_table([[0, 1]])
+
+
+def test_plugboard_table_rejects_a_letter_in_two_pairs():
+    # [[0, 1], [1, 2]] would not be its own inverse
+    for plugboard_settings in ([[0, 1], [1, 2]], [[0, 1], [0, 1]], [[3, 3]]):
+        with pytest.raises(ValueError):
+            enigma_parts.create_plugboard_table(plugboard_settings)
@@ -0,0 +1,126 @@
+"""
+Here are some tests to see if the rotor tables and the direct rotor advance give the same result as turning the rotors one step at a time.
+"""
+
+import pytest
+
+from classes.rotor import Rotor
+from src import enigma_parts
+
+
+def test_inverse_wiring():
+    for rotor_number in range(1, 9):
+        rotor = Rotor(rotor_number, 1, 1)
+
+        # Going through the wiring and back should give the same letter
+        for letter in range(26):
+            assert rotor.inverse_wiring[rotor.wiring[letter]] == letter
+
+
+def test_offset_tables_match_pass_through_rotor():
+    for rotor_number in range(1, 9):
+        for setting in (1, 5, 26):
+            for position in range(26):
+                rotor = Rotor(rotor_number, setting, position)
+                offset = (position - setting) % 26
+
+                for letter in range(26):
+                    assert rotor.forward_tables[offset][
+                        letter
+                    ] == enigma_parts.pass_through_rotor(letter, rotor, False)
+                    assert rotor.inverse_tables[offset][
+                        letter
+                    ] == enigma_parts.pass_through_rotor(letter, rotor, True)
+
+
+def test_rotor_advance_matches_rotor_turn():
+    for numbers in ((1, 2, 3), (3, 2, 1), (5, 4, 2)):
+        for start in ((0, 0, 0), (17, 5, 22), (26, 26, 26), (18, 6, 23)):
+            turned_rotors = [Rotor(number, 1, position) for number, position in zip(numbers, start)]
+
+            for steps in range(1, 20000):
+                Rotor.rotor_turn(turned_rotors)
+
+                if steps % 997 == 0 or steps < 60:
+                    advanced_rotors = [Rotor(number, 1, position) for number, position in zip(numbers, start)]
+                    Rotor.rotor_advance(advanced_rotors, steps)
+
+                    assert [rotor.position % 26 for rotor in advanced_rotors] == [
+                        rotor.position % 26 for rotor in turned_rotors
+                    ]
+
+
+def test_rotors_share_their_wiring():
+    rotor = Rotor(2, 1, 1)
+
+    assert rotor.wiring is Rotor(2, 7, 13).wiring
+    assert not hasattr(rotor, "__dict__")
+
+
+def test_double_notch_rotors_advance_like_rotor_turn():
+    for numbers in ((6, 7, 8), (8, 6, 1), (2, 7, 3)):
+        for start in ((0, 0, 0), (13, 0, 25), (1, 14, 1)):
+            turned_rotors = [Rotor(number, 1, position) for number, position in zip(numbers, start)]
+
+            for steps in range(1, 3000):
+                Rotor.rotor_turn(turned_rotors)
+
+                if steps % 331 == 0 or steps < 60:
+                    advanced_rotors = [Rotor(number, 1, position) for number, position in zip(numbers, start)]
+                    Rotor.rotor_advance(advanced_rotors, steps)
+
+                    assert [rotor.position % 26 for rotor in advanced_rotors] == [
+                        rotor.position % 26 for rotor in turned_rotors
+                    ]
+
+
+def test_double_notch_rotor_turns_the_next_rotor_twice_per_turn():
+    rotors = [Rotor(6, 1, 0), Rotor(1, 1, 0), Rotor(2, 1, 0)]
+
+    for _ in range(26):
+        Rotor.rotor_turn(rotors)
+
+    assert rotors[1].position == 2
+
+
+def test_invalid_rotors_are_rejected_when_built():
+    for number, setting, position in ((9, 1, 1), (0, 1, 1), (1, 0, 1), (1, 27, 1), (1, 1, -1), (1, 1, 27)):
+        with pytest.raises(ValueError):
+            Rotor(number, setting, position)
+
+
+def test_rotor_setters_check_like_the_constructor():
+    rotor = Rotor(1, 1, 1)
+
+    for attribute, value in (("number", 9), ("setting", 0), ("setting", 27), ("position", -1), ("position", 27), ("notch", 26)):
+        with pytest.raises(ValueError):
+            setattr(rotor, attribute, value)
+
+    # Nothing changed, and valid values are kept as they are given, like in __init__()
+    assert (rotor.number, rotor.setting, rotor.position) == (1, 1, 1)
+    rotor.number, rotor.setting, rotor.position = "Beta", 26, 26
+    assert (rotor.number, rotor.setting, rotor.position, rotor.notches) == ("Beta", 26, 26, ())
+
+
+def test_set_wiring_and_set_notch_find_every_rotor():
+    rotor = Rotor(1, 1, 1)
+
+    assert rotor.set_wiring(7) == Rotor(7, 1, 1).wiring
+    assert rotor.set_notch(7) == Rotor(7, 1, 1).notch
+    assert rotor.set_wiring("Beta") == Rotor("Beta", 1, 1).wiring
+    assert rotor.set_notch("Gamma") is None
+
+    for method in (rotor.set_wiring, rotor.set_notch):
+        with pytest.raises(ValueError):
+            method(9)
+
+
+def test_greek_wheel_never_turns():
+    rotors = [Rotor(1, 1, 17), Rotor(2, 1, 5), Rotor(3, 1, 0), Rotor("Beta", 3, 11)]
+
+    for _ in range(700):
+        Rotor.rotor_turn(rotors)
+    Rotor.rotor_advance(rotors, 12345)
+
+    assert rotors[3].position == 11
+    assert Rotor("Gamma", 1, 1).notches == ()
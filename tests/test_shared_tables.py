@@ -0,0 +1,47 @@
+"""
+Here are some tests to see if a machine that reads its tables from a shared table block
+enciphers exactly like a machine that builds its own tables.
+"""
+
+import pytest
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import shared_tables
+from src.shared_tables import SharedTables
+
+
+TEXT = "The quick brown fox jumps over the lazy dog, 1234! " * 40
+
+
+@pytest.mark.parametrize(
+    "rotor_settings",
+    [
+        [(1, 1, 1), (2, 1, 1), (3, 1, 1)],
+        [(5, 7, 3), (4, 26, 25), (1, 13, 0)],
+        [(2, 3, 17), (2, 9, 4), (2, 20, 26)],
+    ],
+)
+def test_machine_with_shared_tables(rotor_settings):
+    plugboard_settings = [[0, 16], [5, 7], [22, 1]]
+
+    with SharedTables.create() as tables:
+        attached = SharedTables.attach(tables.name)
+
+        machine = EnigmaMachine(
+            *[Rotor(*settings) for settings in rotor_settings], plugboard_settings, tables=attached.tables
+        )
+        expected_machine = EnigmaMachine(*[Rotor(*settings) for settings in rotor_settings], plugboard_settings)
+
+        assert machine.encipher(TEXT) == expected_machine.encipher(TEXT)
+        assert machine.positions == expected_machine.positions
+
+        del machine
+        attached.close()
+
+
+def test_tables_of_another_reflector():
+    tables = shared_tables.build_tables(reflector=tuple(range(25, -1, -1)))
+
+    with pytest.raises(SystemExit):
+        EnigmaMachine(Rotor(1, 1, 1), Rotor(2, 1, 1), Rotor(3, 1, 1), [], tables=tables)
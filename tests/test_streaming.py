@@ -0,0 +1,119 @@
+"""
+Here are tests to see if enciphering in chunks gives the same result as enciphering everything at once.
+"""
+
+import io
+
+import pytest
+
+import enigma
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import ciphering_algorithm, streaming
+
+
+PLUGBOARD_SETTINGS = [[6, 10], [3, 11], [8, 24], [0, 16], [5, 7]]
+TEXT = "Log line 42: CONNECTION ACCEPTED from 10.0.0.7\n" * 2000
+
+
+def new_machine():
+    return EnigmaMachine(Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS)
+
+
+def expected_text():
+    return ciphering_algorithm.encipher(
+        TEXT, Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS
+    )
+
+
+def test_encipher_chunks():
+    lines = TEXT.splitlines(keepends=True)
+
+    assert "".join(streaming.encipher_chunks(lines, new_machine())) == expected_text()
+
+
+def test_encipher_stream_text_file():
+    destination = io.StringIO()
+
+    size = streaming.encipher_stream(io.StringIO(TEXT), destination, new_machine(), chunk_size=1000)
+
+    assert size == len(TEXT)
+    assert destination.getvalue() == expected_text()
+
+
+def test_encipher_stream_binary_file():
+    # Bytes that are not ASCII are written as they are
+    data = TEXT.encode("ascii") + bytes([200, 255, 0]) + b"TAIL"
+    destination = io.BytesIO()
+
+    streaming.encipher_stream(io.BytesIO(data), destination, new_machine(), chunk_size=777)
+
+    expected = expected_text().encode("ascii") + bytes([200, 255, 0])
+    assert destination.getvalue()[: len(expected)] == expected
+    assert len(destination.getvalue()) == len(data)
+
+
+def test_encipher_file(tmp_path):
+    input_path = tmp_path / "intercepts.txt"
+    output_path = tmp_path / "intercepts.enc"
+    input_path.write_bytes(TEXT.encode("ascii"))
+
+    size = streaming.encipher_file(str(input_path), str(output_path), new_machine())
+
+    # File mode upper cases the letters first, like enigma.py does with a typed text
+    expected = ciphering_algorithm.encipher(
+        TEXT.upper(), Rotor(3, 12, 1), Rotor(2, 4, 7), Rotor(1, 1, 5), PLUGBOARD_SETTINGS
+    )
+    assert size == len(TEXT)
+    assert output_path.read_bytes() == expected.encode("ascii")
+
+
+def test_encipher_file_twice_gives_back_the_original(tmp_path):
+    input_path = tmp_path / "intercepts.txt"
+    output_path = tmp_path / "intercepts.enc"
+    input_path.write_bytes(TEXT.upper().encode("ascii"))
+
+    streaming.encipher_file(str(input_path), str(output_path), new_machine())
+    streaming.encipher_file(str(output_path), str(input_path), new_machine())
+
+    assert input_path.read_bytes() == TEXT.upper().encode("ascii")
+
+
+def test_encipher_empty_file(tmp_path):
+    input_path = tmp_path / "empty.txt"
+    output_path = tmp_path / "empty.enc"
+    input_path.write_bytes(b"")
+
+    assert streaming.encipher_file(str(input_path), str(output_path), new_machine()) == 0
+    assert output_path.read_bytes() == b""
+
+
+def test_encipher_file_with_lower_case_letters_twice_gives_back_the_upper_cased_original(tmp_path):
+    input_path = tmp_path / "intercepts.txt"
+    output_path = tmp_path / "intercepts.enc"
+    input_path.write_bytes(b"Hello, World\n" * 100)
+
+    streaming.encipher_file(str(input_path), str(output_path), new_machine())
+    streaming.encipher_file(str(output_path), str(input_path), new_machine())
+
+    assert input_path.read_bytes() == b"HELLO, WORLD\n" * 100
+
+
+def test_encipher_file_into_itself(tmp_path):
+    path = tmp_path / "intercepts.txt"
+    path.write_bytes(TEXT.encode("ascii"))
+    expected_path = tmp_path / "intercepts.enc"
+    streaming.encipher_file(str(path), str(expected_path), new_machine())
+
+    size = streaming.encipher_file(str(path), str(path), new_machine())
+
+    assert size == len(TEXT)
+    assert path.read_bytes() == expected_path.read_bytes()
+
+
+def test_enigma_file_mode_with_a_missing_file_exits(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        enigma.main([str(tmp_path / "missing.txt"), str(tmp_path / "out.txt")])
+
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().out.startswith("FileError.")
@@ -0,0 +1,49 @@
+"""
+Here are some tests to see if the table store is written and memory-mapped correctly.
+"""
+
+import pytest
+
+from classes.enigma_machine import EnigmaMachine
+from classes.rotor import Rotor
+from src import bombe, ciphering_algorithm, shared_tables, table_store
+
+
+def test_table_store_roundtrip(tmp_path):
+    store_path = str(tmp_path / "tables.bin")
+
+    size = table_store.write_table_store(store_path)
+    tables = table_store.open_table_store(store_path)
+
+    assert size == shared_tables.tables_size()
+    assert tables[:] == shared_tables.build_tables()
+
+    rotors_settings = [(4, 11, 2), (5, 3, 24), (2, 19, 9)]
+    machine = EnigmaMachine(*[Rotor(*settings) for settings in rotors_settings], [[3, 9]], tables=tables)
+    expected = ciphering_algorithm.encipher(
+        "MEMORY MAPPED TABLES " * 30, *[Rotor(*settings) for settings in rotors_settings], [[3, 9]]
+    )
+    assert machine.encipher("MEMORY MAPPED TABLES " * 30) == expected
+
+    del machine
+    tables.close()
+
+
+def test_bombe_with_table_store(tmp_path):
+    store_path = str(tmp_path / "tables.bin")
+    table_store.write_table_store(store_path)
+
+    plaintext = "WETTERVORHERSAGEBISKAYA"
+    ciphertext = ciphering_algorithm.encipher(plaintext, Rotor(3, 1, 17), Rotor(1, 1, 5), Rotor(2, 1, 22), [])
+
+    stops = bombe.run_bombe(ciphertext, plaintext, rotor_orders=((3, 1, 2),), tables_path=store_path)
+
+    assert stops == bombe.run_bombe(ciphertext, plaintext, rotor_orders=((3, 1, 2),))
+
+
+def test_open_a_file_that_is_not_a_table_store(tmp_path):
+    store_path = tmp_path / "tables.bin"
+    store_path.write_bytes(b"not a table store")
+
+    with pytest.raises(SystemExit):
+        table_store.open_table_store(str(store_path))